@@ -28,6 +28,9 @@ class Config:
     TEMP_DIR = "temp"
     UPLOAD_DIR = "temp/uploads"
     OUTPUT_DIR = "temp/outputs"
+    CACHE_DIR = "temp/cache"  # Converted documents keyed by input content hash
+    MAX_CACHEABLE_SIZE = 100 * 1024 * 1024  # Larger inputs skip the result cache
+    MAX_CACHE_SIZE = 1024 * 1024 * 1024  # Least recently used results are pruned beyond this total
     
     # Enhanced conversion timeouts for large files
     MAX_CONVERSION_TIME = 1800  # 30 minutes for very large files
@@ -45,7 +48,10 @@ class Config:
     IMAGE_QUALITY = 95
     AUDIO_BITRATE = '320k'
     VIDEO_QUALITY = 'crf=23'
+    VIDEO_HW_ACCEL = os.getenv('VIDEO_HW_ACCEL', 'auto').lower()  # 'auto' probes NVENC then QSV; 'off' forces libx264
     PDF_DPI = 300
+    PDF_IMAGE_BATCH_PAGES = 10  # Pages rendered per pdf2image call for multi-page exports
+    PDF_DOCX_PARALLEL_PAGES = 32  # Below this, pdf2docx worker start-up costs more than it saves
     
     # Queue management
     processing_queue = asyncio.Queue()
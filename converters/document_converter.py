@@ -1,16 +1,484 @@
 import os
 import asyncio
+import atexit
+import csv
+import hashlib
 import logging
+import mmap
+import multiprocessing
+import shutil
+import socket
 import subprocess
+import sys
+import threading
+import time
+import uuid
+from contextlib import asynccontextmanager, contextmanager
 from typing import List
 import tempfile
-import aiofiles
+from collections import OrderedDict
+from concurrent.futures import ProcessPoolExecutor
+from io import BytesIO
+from config import Config
+
+# Optional backends are imported once here; None marks a missing one
+try:
+    import fitz  # PyMuPDF
+except ImportError:
+    fitz = None
+
+try:
+    from blake3 import blake3
+except ImportError:
+    blake3 = None
+
+try:
+    import pypdfium2 as pdfium
+except ImportError:
+    pdfium = None
+
+try:
+    import pdfplumber
+except ImportError:
+    pdfplumber = None
+
+try:
+    from pdf2docx import Converter as Pdf2DocxConverter
+except ImportError:
+    Pdf2DocxConverter = None
+
+try:
+    from docx2pdf import convert as docx2pdf_convert
+except ImportError:
+    docx2pdf_convert = None
+
+try:
+    from docx import Document
+except ImportError:
+    Document = None
+
+try:
+    from python_calamine import CalamineWorkbook
+except ImportError:
+    CalamineWorkbook = None
+
+try:
+    import xlsxwriter
+except ImportError:
+    xlsxwriter = None
+
+try:
+    import polars as pl
+except ImportError:
+    pl = None
+
+try:
+    import pandas as pd
+except ImportError:
+    pd = None
+
+try:
+    import img2pdf
+except ImportError:
+    img2pdf = None
+
+try:
+    from PIL import Image
+except ImportError:
+    Image = None
+
+try:
+    from weasyprint import HTML as WeasyHTML, default_url_fetcher
+except (ImportError, OSError):
+    # WeasyPrint raises OSError when its Pango/Cairo libraries are missing
+    WeasyHTML = None
+
+try:
+    from pdf2image import convert_from_path
+    HAVE_PDF2IMAGE = True
+except ImportError:
+    HAVE_PDF2IMAGE = False
+
+try:
+    import numpy as np
+    import simplejpeg
+    HAVE_SIMPLEJPEG = True
+except ImportError:
+    HAVE_SIMPLEJPEG = False
 
 logger = logging.getLogger(__name__)
 
+# PDFs shorter than this are extracted in-process (worker spawn costs more)
+PARALLEL_PAGE_THRESHOLD = 8
+MAX_PAGE_WORKERS = int(os.environ.get('CONV_WORKERS', min(os.cpu_count() or 1, 4)))
+
+# Output files are written page by page through a large buffer
+WRITE_BUFFER_SIZE = 1 << 20
+
+# Parsed PDFs kept open for reuse across output formats
+DOC_CACHE_SIZE = 8
+# Extracted page text kept for reuse, in bytes of str objects held
+PAGE_TEXT_CACHE_BYTES = 64 * 1024 * 1024
+
+# MuPDF's object store is emptied every this many pages to bound memory
+STORE_SHRINK_PAGES = 50
+
+# Resolution for single-page PDF previews
+PDF_IMAGE_DPI = 150
+
+# Long-lived LibreOffice listeners, driven through unoconv
+LIBREOFFICE_PORT = int(os.environ.get('LIBREOFFICE_PORT', 2002))
+LIBREOFFICE_LISTENERS = int(os.environ.get('LIBREOFFICE_LISTENERS', 2))
+# Listeners are recycled after this many jobs to contain soffice memory growth
+LISTENER_MAX_JOBS = 50
+# How long a fresh listener gets to open its UNO socket before it is respawned
+LISTENER_START_TIMEOUT = 30
+LISTENER_START_ATTEMPTS = 2
+# Per-listener profiles so instances (and one-off `libreoffice --headless` calls) don't hand off to each other
+LISTENER_PROFILE = os.path.join(tempfile.gettempdir(), 'file_converter_lo_profile')
+# Cold LibreOffice requests arriving within this window share one soffice start
+LIBREOFFICE_BATCH_WINDOW = 0.15
+
+# Block size for hashing inputs into the result cache
+HASH_BLOCK_SIZE = 1 << 20
+
+# Single-pass HTML escaping (same replacements as html.escape)
+_ESCAPE_TABLE = str.maketrans({'&': '&amp;', '<': '&lt;', '>': '&gt;', '"': '&quot;', "'": '&#x27;'})
+
+_HTML_HEAD = """<!DOCTYPE html>
+<html>
+<head>
+    <meta charset="UTF-8">
+    <title>Converted Document</title>
+</head>
+<body>
+"""
+_HTML_TAIL = "</body>\n</html>\n"
+
+# Plain text is escaped chunk by chunk between these, never held whole in memory
+_TXT_HTML_HEAD = _HTML_HEAD + "    <pre>"
+_TXT_HTML_TAIL = "</pre>\n" + _HTML_TAIL
+
+class _CachedDocument:
+    """An open fitz.Document plus the bookkeeping needed to share it between threads"""
+    __slots__ = ('doc', 'lock', 'users', 'evicted')
+    
+    def __init__(self, doc):
+        self.doc = doc
+        self.lock = threading.Lock()
+        self.users = 0
+        self.evicted = False
+
+_open_documents = OrderedDict()
+_open_documents_lock = threading.Lock()
+
+def _evict_pdf_document(key) -> None:
+    """Drop a cache entry; the handle is closed now or by its last user (lock held by caller)"""
+    entry = _open_documents.pop(key)
+    entry.evicted = True
+    if not entry.users:
+        entry.doc.close()
+
+@contextmanager
+def _pdf_document(path: str):
+    """Borrow the open fitz.Document for the current version of path (LRU, one thread at a time)"""
+    st = os.stat(path)
+    key = (path, st.st_mtime_ns, st.st_size)
+    with _open_documents_lock:
+        # Don't keep handles to uploads that have already been cleaned up
+        for stale in [k for k in _open_documents if not os.path.exists(k[0])]:
+            _evict_pdf_document(stale)
+        
+        entry = _open_documents.get(key)
+        if entry is None:
+            entry = _CachedDocument(fitz.open(path))
+            _open_documents[key] = entry
+            if len(_open_documents) > DOC_CACHE_SIZE:
+                _evict_pdf_document(next(iter(_open_documents)))
+        else:
+            _open_documents.move_to_end(key)
+        entry.users += 1
+    
+    try:
+        # MuPDF documents are not safe to use from two threads at once
+        with entry.lock:
+            yield entry.doc
+    finally:
+        with _open_documents_lock:
+            entry.users -= 1
+            if entry.evicted and not entry.users:
+                entry.doc.close()
+
+def _pdf_page_count(path: str) -> int:
+    """Page count of a PDF, reusing the cached handle"""
+    with _pdf_document(path) as doc:
+        return len(doc)
+
+def _page_texts(doc, start: int, end: int, mode: str = 'text') -> list:
+    """Extract text for pages [start, end) of an open document"""
+    fitz.TOOLS.mupdf_display_errors(False)
+    
+    # Plain text needs no image or span-structure handling
+    flags = None
+    if mode == 'text':
+        flags = fitz.TEXT_PRESERVE_WHITESPACE | fitz.TEXT_PRESERVE_LIGATURES | fitz.TEXT_MEDIABOX_CLIP
+    
+    pages = []
+    for i in range(start, end):
+        pages.append(doc.load_page(i).get_text(mode, flags=flags, sort=False))
+        if (i - start) % STORE_SHRINK_PAGES == STORE_SHRINK_PAGES - 1:
+            fitz.TOOLS.store_shrink(100)
+    return pages
+
+def _extract_pages(path: str, start: int, end: int, mode: str = 'text') -> list:
+    """Extract text for pages [start, end) - runs inside worker processes"""
+    with fitz.open(path) as doc:
+        return _page_texts(doc, start, end, mode)
+
+def _extract_pdf_pages(path: str, mode: str = 'text') -> tuple:
+    """Extract per-page text with PyMuPDF"""
+    with _pdf_document(path) as doc:
+        page_count = len(doc)
+        if page_count < PARALLEL_PAGE_THRESHOLD:
+            return tuple(_page_texts(doc, 0, page_count, mode))
+    
+    # MuPDF holds the GIL while parsing, so split contiguous page ranges across processes
+    step = -(-page_count // MAX_PAGE_WORKERS)
+    starts = list(range(0, page_count, step))
+    ends = [min(start + step, page_count) for start in starts]
+    
+    chunks = _process_pool.map(_extract_pages, [path] * len(starts), starts, ends, [mode] * len(starts))
+    return tuple(text for chunk in chunks for text in chunk)
+
+_page_text_cache = OrderedDict()
+_page_text_cache_lock = threading.Lock()
+
+def _cached_pdf_pages(path: str, mode: str = 'text') -> tuple:
+    """Per-page text for the current version of path (LRU, bounded by PAGE_TEXT_CACHE_BYTES)"""
+    st = os.stat(path)
+    key = (path, st.st_mtime_ns, st.st_size, mode)
+    with _page_text_cache_lock:
+        # Uploads are deleted after conversion; their text can never be asked for again
+        for stale in [k for k in _page_text_cache if not os.path.exists(k[0])]:
+            del _page_text_cache[stale]
+        
+        cached = _page_text_cache.get(key)
+        if cached is not None:
+            _page_text_cache.move_to_end(key)
+            return cached[0]
+    
+    pages = _extract_pdf_pages(path, mode)
+    size = sum(sys.getsizeof(text) for text in pages)
+    if size > PAGE_TEXT_CACHE_BYTES:
+        return pages
+    
+    with _page_text_cache_lock:
+        _page_text_cache[key] = (pages, size)
+        while sum(entry_size for _, entry_size in _page_text_cache.values()) > PAGE_TEXT_CACHE_BYTES:
+            _page_text_cache.popitem(last=False)
+    return pages
+
+def _render_pages(path: str, start: int, end: int, dpi: int, output_stem: str, output_format: str) -> list:
+    """Rasterize pages [start, end) straight to disk - runs inside worker processes"""
+    paths = []
+    with fitz.open(path) as doc:
+        for i in range(start, end):
+            pix = doc.load_page(i).get_pixmap(dpi=dpi)
+            img_path = f"{output_stem}_page{i + 1}.{output_format}"
+            if output_format.lower() in ['jpg', 'jpeg']:
+                pix.save(img_path, jpg_quality=90)
+            elif output_format.lower() == 'png':
+                pix.save(img_path)
+            else:
+                # Formats MuPDF can't encode go through Pillow
+                pix.pil_save(img_path)
+            paths.append(img_path)
+    return paths
+
+def _init_worker():
+    """Import heavy libraries once per worker process"""
+    try:
+        import fitz  # noqa: F401
+    except ImportError:
+        pass
+
+# Shared worker pool for CPU-bound conversions; workers are started on first use.
+# Forking the threaded bot directly could copy a held lock into a worker, so they come from a forkserver
+_process_pool = ProcessPoolExecutor(
+    max_workers=MAX_PAGE_WORKERS,
+    initializer=_init_worker,
+    mp_context=multiprocessing.get_context(
+        'forkserver' if 'forkserver' in multiprocessing.get_all_start_methods() else 'spawn'
+    )
+)
+atexit.register(_process_pool.shutdown)
+
+def _file_digest(path: str) -> str:
+    """Hash file contents for the result cache (BLAKE3 when available)"""
+    # BLAKE2b outruns SHA-256 on 64-bit CPUs and 128 bits is plenty for a cache key
+    hasher = blake3() if blake3 is not None else hashlib.blake2b(digest_size=16)
+    with open(path, 'rb') as f:
+        size = os.fstat(f.fileno()).st_size
+        if not size:
+            return hasher.hexdigest()
+        # Hash straight from the page cache instead of copying each block into a bytes object
+        with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mm, memoryview(mm) as view:
+            for offset in range(0, size, HASH_BLOCK_SIZE):
+                hasher.update(view[offset:offset + HASH_BLOCK_SIZE])
+    return hasher.hexdigest()
+
+def _inline_url_fetcher(url: str, **kwargs):
+    """WeasyPrint URL fetcher for untrusted HTML - only inline data: URLs are resolved"""
+    # file:// would embed server files in the PDF and http(s) would let uploads probe the network
+    if not url.startswith('data:'):
+        raise ValueError(f"External resource blocked: {url}")
+    return default_url_fetcher(url, **kwargs)
+
+def _run_pdf2docx(input_path: str, output_path: str, parallel: bool = False) -> str:
+    """Run pdf2docx - runs inside a worker process unless parallel"""
+    options = {'multi_processing': True, 'cpu_count': MAX_PAGE_WORKERS} if parallel else {}
+    cv = Pdf2DocxConverter(input_path)
+    try:
+        cv.convert(output_path, start=0, end=None, **options)
+    finally:
+        cv.close()
+    return output_path
+
+# Headless soffice listeners, each with its own port and profile, handed out one job at a time
+class LibreOfficeServerPool:
+    def __init__(self, size: int, base_port: int):
+        self.size = size
+        self.base_port = base_port
+        # Checked once; listeners themselves start lazily on first use
+        self.available = shutil.which('unoconv') is not None and shutil.which('soffice') is not None
+        self._processes = [None] * size
+        self._jobs = [0] * size
+        self._idle = None
+        atexit.register(self.shutdown)
+    
+    def connection(self, slot: int) -> str:
+        """UNO connection string for a listener slot"""
+        return f"socket,host=127.0.0.1,port={self.base_port + slot};urp;StarOffice.ComponentContext"
+    
+    @asynccontextmanager
+    async def acquire(self):
+        """Borrow an idle listener, (re)starting it if needed; yields its connection string"""
+        if self._idle is None:
+            self._idle = asyncio.Queue()
+            for slot in range(self.size):
+                self._idle.put_nowait(slot)
+        
+        slot = await self._idle.get()
+        try:
+            # Starting soffice and waiting for an old listener to exit both block
+            await asyncio.to_thread(self._ensure_running, slot)
+            # Only reached once the listener has answered its ping
+            self._jobs[slot] += 1
+            yield self.connection(slot)
+        finally:
+            self._idle.put_nowait(slot)
+    
+    def _ensure_running(self, slot: int):
+        """Start a listener, restarting it if it died or has served LISTENER_MAX_JOBS jobs"""
+        process = self._processes[slot]
+        if process is not None and process.poll() is None and self._jobs[slot] < LISTENER_MAX_JOBS:
+            # A live process can still have a wedged or closed socket
+            if self._is_answering(slot):
+                return
+        
+        if process is not None:
+            logger.info(f"Restarting LibreOffice listener {slot}")
+            self._stop(process)
+        
+        for attempt in range(LISTENER_START_ATTEMPTS):
+            process = subprocess.Popen(
+                [
+                    'soffice', '--headless', '--invisible', '--nologo', '--norestore',
+                    f'-env:UserInstallation=file://{LISTENER_PROFILE}_{slot}',
+                    f'--accept={self.connection(slot)}'
+                ],
+                stdout=subprocess.DEVNULL,
+                stderr=subprocess.DEVNULL
+            )
+            self._processes[slot] = process
+            
+            # unoconv against a socket that isn't accepting yet would start its own office
+            if self._wait_until_ready(slot, process):
+                self._jobs[slot] = 0
+                return
+            
+            logger.warning(f"LibreOffice listener {slot} did not come up (attempt {attempt + 1})")
+            self._stop(process)
+        
+        raise Exception(f"LibreOffice listener {slot} failed to start")
+    
+    def _is_answering(self, slot: int) -> bool:
+        """Ping a listener by opening a connection to its UNO socket"""
+        try:
+            with socket.create_connection(('127.0.0.1', self.base_port + slot), timeout=1):
+                return True
+        except OSError:
+            return False
+    
+    def _wait_until_ready(self, slot: int, process) -> bool:
+        """Poll the listener's port until it accepts, it exits, or LISTENER_START_TIMEOUT passes"""
+        deadline = time.monotonic() + LISTENER_START_TIMEOUT
+        while time.monotonic() < deadline:
+            if process.poll() is not None:
+                return False
+            if self._is_answering(slot):
+                return True
+            time.sleep(0.2)
+        return False
+    
+    def _stop(self, process):
+        """Terminate one listener process"""
+        if process.poll() is None:
+            process.terminate()
+            try:
+                process.wait(timeout=5)
+            except subprocess.TimeoutExpired:
+                process.kill()
+    
+    def shutdown(self):
+        """Terminate all listeners at interpreter exit"""
+        for process in self._processes:
+            if process is not None:
+                self._stop(process)
+
+office_pool = LibreOfficeServerPool(LIBREOFFICE_LISTENERS, LIBREOFFICE_PORT)
+
 class DocumentConverter:
+    # Resolved once at import; distro packages ship either name
+    _libreoffice_path = shutil.which('libreoffice') or shutil.which('soffice')
+    
     def __init__(self):
         self.supported_formats = ['pdf', 'docx', 'doc', 'txt', 'html', 'xlsx', 'xls', 'pptx', 'ppt', 'csv', 'odt', 'ods', 'odp']
+        
+        # Extension groups used for routing
+        self._doc_exts = frozenset({'docx', 'doc'})
+        self._html_exts = frozenset({'html', 'htm'})
+        self._img_exts = frozenset({'jpg', 'jpeg', 'png', 'webp'})
+        self._unsupported_exts = frozenset({'torrent', 'zip', 'rar'})
+        
+        # Pairs whose bytes are already valid in the target format
+        self._copy_pairs = frozenset({('htm', 'html'), ('html', 'htm'), ('txt', 'md'), ('md', 'txt')})
+        
+        # Dedicated handlers by (input, output); anything else goes to PDF export or LibreOffice
+        self._routes = {
+            ('pdf', 'txt'): self._convert_pdf_to_txt,
+            ('pdf', 'html'): self._convert_pdf_to_html,
+            ('xlsx', 'csv'): self._convert_xlsx_to_csv,
+            ('csv', 'xlsx'): self._convert_csv_to_xlsx,
+            ('txt', 'html'): self._convert_txt_to_html,
+        }
+        self._routes.update({('pdf', ext): self._convert_pdf_to_docx for ext in self._doc_exts})
+        self._routes.update({('pdf', ext): self._convert_pdf_to_image_route for ext in self._img_exts})
+        
+        # Cold LibreOffice jobs waiting to be batched, by output format
+        self._lo_pending = {}
+        self._lo_flush_tasks = set()
+        self._lo_batch_callers = 0
     
     async def convert_document(self, input_path: str, output_format: str) -> str:
         """Convert document to target format"""
@@ -23,210 +491,440 @@ class DocumentConverter:
             # Generate output path
             output_path = os.path.splitext(input_path)[0] + f'_converted.{output_format}'
             
+            # Same format or a renaming-only pair - plain copy (uses sendfile on Linux)
+            if input_ext == output_format or (input_ext, output_format) in self._copy_pairs:
+                await asyncio.to_thread(shutil.copyfile, input_path, output_path)
+                return output_path
+            
             # Handle unsupported formats
-            if output_format in ['torrent', 'zip', 'rar']:
+            if output_format in self._unsupported_exts:
                 raise Exception(f"Cannot convert to {output_format.upper()} - unsupported format")
             
-            # Route to specific conversion method
-            if input_ext == 'pdf':
-                return await self._convert_from_pdf(input_path, output_path, output_format)
-            elif output_format == 'pdf':
-                return await self._convert_to_pdf(input_path, output_path, input_ext)
-            else:
-                # Try specific converters first, then LibreOffice
-                return await self._convert_with_fallback(input_path, output_path, input_ext, output_format)
+            # Identical content was converted before - reuse that result
+            cache_path = None
+            if os.path.getsize(input_path) <= Config.MAX_CACHEABLE_SIZE:
+                digest = await asyncio.to_thread(_file_digest, input_path)
+                cache_path = os.path.join(Config.CACHE_DIR, f"{digest}.{output_format}")
+                if os.path.exists(cache_path):
+                    # Hand back the same path the uncached route would have produced
+                    cached_output_path = self._route_output_path(input_path, output_path, input_ext, output_format)
+                    try:
+                        await asyncio.to_thread(self._reuse_cached_result, cache_path, cached_output_path)
+                        logger.info(f"Result cache hit: {cache_path}")
+                        return cached_output_path
+                    except FileNotFoundError:
+                        # Pruned between the check and the copy - convert as usual
+                        pass
+            
+            result_path = await self._route_conversion(input_path, output_path, input_ext, output_format)
+            
+            if cache_path and os.path.exists(result_path):
+                await asyncio.to_thread(self._store_cached_result, result_path, cache_path)
+            return result_path
                 
         except Exception as e:
             logger.error(f"Document conversion error: {e}")
             raise Exception(f"Document conversion failed: {str(e)}")
     
-    async def _convert_from_pdf(self, input_path: str, output_path: str, output_format: str) -> str:
-        """Convert PDF to other formats"""
+    async def _route_conversion(self, input_path: str, output_path: str, input_ext: str, output_format: str) -> str:
+        """Route to specific conversion method"""
+        handler = self._routes.get((input_ext, output_format))
+        if handler is not None:
+            return await handler(input_path, output_path)
+        elif output_format == 'pdf':
+            return await self._convert_to_pdf(input_path, output_path, input_ext)
+        else:
+            return await self._convert_with_libreoffice(input_path, output_path, output_format)
+    
+    def _route_output_path(self, input_path: str, output_path: str, input_ext: str, output_format: str) -> str:
+        """Path a conversion's result is written to (PDF page exports name their own file)"""
+        if input_ext == 'pdf' and output_format in self._img_exts:
+            return os.path.splitext(input_path)[0] + f'_page1.{output_format}'
+        return output_path
+    
+    def _store_cached_result(self, result_path: str, cache_path: str):
+        """Add a finished conversion to the result cache"""
         try:
-            if output_format in ['docx', 'doc']:
-                return await self._convert_pdf_to_docx(input_path, output_path)
-            elif output_format == 'txt':
-                return await self._convert_pdf_to_txt(input_path, output_path)
-            elif output_format == 'html':
-                return await self._convert_pdf_to_html(input_path, output_path)
-            elif output_format in ['jpg', 'jpeg', 'png', 'webp']:
-                return await self.convert_pdf_to_image(input_path, output_format)
-            else:
-                return await self._convert_with_libreoffice(input_path, output_path, output_format)
-        except Exception as e:
-            logger.error(f"PDF conversion error: {e}")
-            raise Exception(f"PDF to {output_format} conversion failed")
+            os.makedirs(Config.CACHE_DIR, exist_ok=True)
+            # Stage under a name unique to this call so readers and concurrent writers never see a partial file
+            temp_path = f"{cache_path}.{uuid.uuid4().hex}.tmp"
+            try:
+                # A copy, not a link: in-place writers reusing an output name must not reach the cache
+                shutil.copyfile(result_path, temp_path)
+                os.replace(temp_path, cache_path)
+            except OSError:
+                if os.path.exists(temp_path):
+                    os.remove(temp_path)
+                raise
+            self._prune_result_cache()
+        except OSError as e:
+            logger.warning(f"Could not cache conversion result: {e}")
+    
+    def _reuse_cached_result(self, cache_path: str, output_path: str):
+        """Copy a cached result to the output path, marking it recently used"""
+        # mtime doubles as the last-use time; atime is unreliable under relatime/noatime
+        os.utime(cache_path)
+        # copyfile uses sendfile on Linux, and the cache keeps its own inode
+        shutil.copyfile(cache_path, output_path)
+    
+    def _prune_result_cache(self):
+        """Delete least recently used cache entries until the cache fits Config.MAX_CACHE_SIZE"""
+        entries = []
+        total_size = 0
+        with os.scandir(Config.CACHE_DIR) as it:
+            for entry in it:
+                if entry.name.endswith('.tmp'):
+                    continue
+                try:
+                    st = entry.stat()
+                except FileNotFoundError:
+                    continue
+                entries.append((st.st_mtime, st.st_size, entry.path))
+                total_size += st.st_size
+        
+        if total_size <= Config.MAX_CACHE_SIZE:
+            return
+        
+        entries.sort()
+        for _, size, path in entries:
+            try:
+                os.remove(path)
+            except FileNotFoundError:
+                pass
+            total_size -= size
+            if total_size <= Config.MAX_CACHE_SIZE:
+                break
     
     async def _convert_to_pdf(self, input_path: str, output_path: str, input_format: str) -> str:
         """Convert various formats to PDF"""
         try:
-            # Use docx2pdf for Word documents
-            if input_format in ['docx', 'doc']:
-                try:
-                    from docx2pdf import convert
-                    convert(input_path, output_path)
-                    return output_path
-                except ImportError:
-                    pass
+            # Use docx2pdf for Word documents (drives MS Word, so Windows/macOS only)
+            if input_format in self._doc_exts and docx2pdf_convert is not None and sys.platform in ('win32', 'darwin'):
+                # keep_active leaves Word running between calls instead of restarting it per file
+                await asyncio.to_thread(docx2pdf_convert, input_path, output_path, keep_active=True)
+                return output_path
+            
+            # Use WeasyPrint for HTML - one call, no office suite startup
+            if input_format in self._html_exts and WeasyHTML is not None:
+                await asyncio.to_thread(self._write_html_pdf, input_path, output_path)
+                return output_path
             
             # Use LibreOffice for other formats
             return await self._convert_with_libreoffice(input_path, output_path, 'pdf')
-                
+        
         except Exception as e:
             logger.error(f"To PDF conversion error: {e}")
             raise Exception(f"{input_format} to PDF conversion failed")
     
-    async def _convert_with_fallback(self, input_path: str, output_path: str, input_ext: str, output_format: str) -> str:
-        """Try multiple conversion methods"""
-        try:
-            # Try LibreOffice first
-            return await self._convert_with_libreoffice(input_path, output_path, output_format)
-        except Exception as e:
-            logger.warning(f"LibreOffice conversion failed, trying alternatives: {e}")
-            
-            # Try specific format handlers
-            if input_ext == 'xlsx' and output_format == 'csv':
-                return await self._convert_xlsx_to_csv(input_path, output_path)
-            elif input_ext == 'csv' and output_format == 'xlsx':
-                return await self._convert_csv_to_xlsx(input_path, output_path)
-            elif input_ext == 'txt' and output_format == 'html':
-                return await self._convert_txt_to_html(input_path, output_path)
-            else:
-                raise Exception(f"No conversion method available for {input_ext} to {output_format}")
+    def _write_html_pdf(self, input_path: str, output_path: str):
+        """Parse and render uploaded HTML to PDF without fetching external resources"""
+        WeasyHTML(filename=input_path, url_fetcher=_inline_url_fetcher).write_pdf(output_path)
     
     async def _convert_pdf_to_docx(self, input_path: str, output_path: str) -> str:
         """Convert PDF to DOCX using pdf2docx"""
-        try:
-            from pdf2docx import Converter
-            
-            cv = Converter(input_path)
-            cv.convert(output_path, start=0, end=None)
-            cv.close()
-            return output_path
+        if Pdf2DocxConverter is not None:
+            page_count = await asyncio.to_thread(_pdf_page_count, input_path)
+            if page_count >= Config.PDF_DOCX_PARALLEL_PAGES:
+                # pdf2docx splits page ranges over its own processes, so it can't run inside a pool worker
+                return await asyncio.to_thread(_run_pdf2docx, input_path, output_path, True)
             
-        except ImportError:
-            # Fallback to LibreOffice
-            return await self._convert_with_libreoffice(input_path, output_path, 'docx')
+            # Layout analysis is CPU-bound Python, so it runs in a worker process
+            loop = asyncio.get_running_loop()
+            return await loop.run_in_executor(_process_pool, _run_pdf2docx, input_path, output_path)
+        
+        if fitz is not None and Document is not None:
+            return await self._fallback_pdf_to_docx(input_path, output_path)
+        
+        # Fallback to LibreOffice
+        return await self._convert_with_libreoffice(input_path, output_path, 'docx')
+    
+    async def _fallback_pdf_to_docx(self, input_path: str, output_path: str) -> str:
+        """Build a plain DOCX from the cached PyMuPDF page text"""
+        return await asyncio.to_thread(self._write_docx_from_pages, input_path, output_path)
+    
+    def _write_docx_from_pages(self, input_path: str, output_path: str) -> str:
+        """Write PDF page text into a new DOCX document"""
+        pages = self._open_pdf_cached(input_path)
+        
+        document = Document()
+        for page_num, page_text in enumerate(pages):
+            if page_num:
+                document.add_page_break()
+            for line in page_text.splitlines():
+                if line.strip():
+                    document.add_paragraph(line)
+        
+        document.save(output_path)
+        return output_path
+    
+    def _open_pdf_cached(self, input_path: str, mode: str = 'text') -> tuple:
+        """Return per-page PDF text, reusing earlier extractions of the same file"""
+        return _cached_pdf_pages(input_path, mode)
     
-    async def _convert_pdf_to_txt(self, input_path: str, output_path: str) -> str:
+    def _write_pdf_pages(self, input_path: str, output_path: str, mode: str = 'text') -> str:
+        """Write cached PDF page text to the output file"""
+        pages = self._open_pdf_cached(input_path, mode)
+        
+        with open(output_path, 'w', encoding='utf-8', buffering=WRITE_BUFFER_SIZE) as f:
+            # PyMuPDF's per-page "xhtml" output is a bare <div>; one wrapper makes the whole file valid
+            if mode == 'xhtml':
+                f.write(_HTML_HEAD)
+            f.writelines(pages)
+            if mode == 'xhtml':
+                f.write(_HTML_TAIL)
+        return output_path
+    
+    def _write_pdfplumber_text(self, input_path: str, output_path: str, layout: bool = False) -> str:
+        """Extract PDF text with pdfplumber straight into the output file"""
+        with pdfplumber.open(input_path) as pdf, \
+                open(output_path, 'w', encoding='utf-8', buffering=WRITE_BUFFER_SIZE) as f:
+            for page in pdf.pages:
+                page_text = page.extract_text(layout=layout)
+                # pdfplumber keeps every parsed page's objects alive otherwise
+                page.flush_cache()
+                if page_text:
+                    f.write(page_text)
+                    f.write("\n")
+        
+        return output_path
+    
+    async def _convert_pdf_to_txt(self, input_path: str, output_path: str, layout: bool = False) -> str:
         """Convert PDF to text"""
-        try:
-            import pdfplumber
-            
-            text = ""
-            with pdfplumber.open(input_path) as pdf:
-                for page in pdf.pages:
-                    page_text = page.extract_text()
-                    if page_text:
-                        text += page_text + "\n"
-            
-            async with aiofiles.open(output_path, 'w', encoding='utf-8') as f:
-                await f.write(text)
-            
-            return output_path
-            
-        except ImportError:
-            # Try PyMuPDF as fallback
-            try:
-                import fitz
-                doc = fitz.open(input_path)
-                text = ""
-                for page in doc:
-                    text += page.get_text()
-                
-                async with aiofiles.open(output_path, 'w', encoding='utf-8') as f:
-                    await f.write(text)
-                return output_path
-            except ImportError:
-                return await self._convert_with_libreoffice(input_path, output_path, 'txt')
+        # PyMuPDF's C core is much faster than pdfminer; pdfplumber only when layout matters
+        if pdfplumber is not None and (layout or fitz is None):
+            return await asyncio.to_thread(self._write_pdfplumber_text, input_path, output_path, layout)
+        
+        if fitz is not None:
+            return await asyncio.to_thread(self._write_pdf_pages, input_path, output_path)
+        
+        return await self._convert_with_libreoffice(input_path, output_path, 'txt')
     
     async def _convert_pdf_to_html(self, input_path: str, output_path: str) -> str:
         """Convert PDF to HTML"""
-        try:
+        if fitz is not None:
             # Use PyMuPDF for PDF to HTML
-            import fitz
-            doc = fitz.open(input_path)
-            html_content = ""
-            for page in doc:
-                html_content += page.get_text("html")
-            
-            async with aiofiles.open(output_path, 'w', encoding='utf-8') as f:
-                await f.write(html_content)
-            return output_path
-        except ImportError:
-            return await self._convert_with_libreoffice(input_path, output_path, 'html')
+            return await asyncio.to_thread(self._write_pdf_pages, input_path, output_path, 'xhtml')
+        
+        return await self._convert_with_libreoffice(input_path, output_path, 'html')
+    
+    async def convert_pdf_pages_to_images(self, input_path: str, output_format: str, dpi: int = PDF_IMAGE_DPI) -> List[str]:
+        """Render every PDF page to an image file, spreading page ranges across worker processes"""
+        if fitz is None:
+            raise Exception("Multi-page PDF rendering requires PyMuPDF")
+        
+        page_count = await asyncio.to_thread(_pdf_page_count, input_path)
+        if not page_count:
+            raise Exception("No pages found in PDF")
+        
+        # Each worker opens its own copy - MuPDF documents can't be shared across processes
+        step = -(-page_count // MAX_PAGE_WORKERS)
+        output_stem = os.path.splitext(input_path)[0]
+        loop = asyncio.get_running_loop()
+        chunks = await asyncio.gather(*[
+            loop.run_in_executor(
+                _process_pool, _render_pages, input_path, start, min(start + step, page_count),
+                dpi, output_stem, output_format
+            )
+            for start in range(0, page_count, step)
+        ])
+        return [path for chunk in chunks for path in chunk]
     
     async def convert_pdf_to_image(self, input_path: str, output_format: str) -> str:
         """Convert PDF to image"""
+        if fitz is not None:
+            # PyMuPDF renders in-process; pdf2image forks a Poppler subprocess
+            return await asyncio.to_thread(self._render_first_page, input_path, output_format)
+        
+        if pdfium is not None:
+            # PDFium is also in-process, so it still avoids the Poppler fork
+            return await asyncio.to_thread(self._render_first_page_pdfium, input_path, output_format)
+        
+        if not HAVE_PDF2IMAGE:
+            raise Exception("PDF to image conversion requires PyMuPDF, pypdfium2 or pdf2image")
+        return await self._fallback_pdf_to_image(input_path, output_format)
+    
+    async def _convert_pdf_to_image_route(self, input_path: str, output_path: str) -> str:
+        """Route adapter - render the first PDF page in the output path's format"""
+        return await self.convert_pdf_to_image(input_path, os.path.splitext(output_path)[1].lstrip('.'))
+    
+    async def _fallback_pdf_to_image(self, input_path: str, output_format: str) -> str:
+        """Convert PDF to image using pdf2image"""
+        if output_format.lower() in ['jpg', 'jpeg', 'png']:
+            return await asyncio.to_thread(self._render_first_page_poppler, input_path, output_format)
+        
+        images = await asyncio.to_thread(
+            convert_from_path, input_path, dpi=PDF_IMAGE_DPI, first_page=1, last_page=1, thread_count=1
+        )
+        if images:
+            output_path = os.path.splitext(input_path)[0] + f'_page1.{output_format}'
+            await asyncio.to_thread(self._save_page_image, images[0], output_path, output_format)
+            return output_path
+        else:
+            raise Exception("No pages found in PDF")
+    
+    def _render_first_page(self, input_path: str, output_format: str, dpi: int = PDF_IMAGE_DPI) -> str:
+        """Rasterize the first PDF page with PyMuPDF"""
+        with _pdf_document(input_path) as doc:
+            if not len(doc):
+                raise Exception("No pages found in PDF")
+            pix = doc[0].get_pixmap(dpi=dpi)
+        
+        output_path = os.path.splitext(input_path)[0] + f'_page1.{output_format}'
+        if output_format.lower() in ['jpg', 'jpeg']:
+            # JPEG encodes page rasters much faster than zlib-based PNG
+            with open(output_path, 'wb') as f:
+                f.write(self._encode_pixmap_jpeg(pix))
+        elif output_format.lower() == 'png':
+            pix.save(output_path)
+        else:
+            # Formats MuPDF can't encode (e.g. WebP) go through Pillow
+            pix.pil_save(output_path)
+        return output_path
+    
+    def _render_first_page_poppler(self, input_path: str, output_format: str, dpi: int = PDF_IMAGE_DPI) -> str:
+        """Have pdftocairo write the first page in the target format, skipping a PIL re-save"""
+        output_path = os.path.splitext(input_path)[0] + f'_page1.{output_format}'
+        poppler_format = 'png' if output_format.lower() == 'png' else 'jpeg'
+        
+        with tempfile.TemporaryDirectory(dir=os.path.dirname(output_path) or '.') as render_dir:
+            rendered = convert_from_path(
+                input_path, dpi=dpi, first_page=1, last_page=1, output_folder=render_dir,
+                fmt=poppler_format, use_pdftocairo=True, single_file=True, paths_only=True,
+                jpegopt={'quality': 90, 'progressive': True, 'optimize': True} if poppler_format == 'jpeg' else None
+            )
+            if not rendered:
+                raise Exception("No pages found in PDF")
+            os.replace(rendered[0], output_path)
+        return output_path
+    
+    def _render_first_page_pdfium(self, input_path: str, output_format: str, dpi: int = PDF_IMAGE_DPI) -> str:
+        """Rasterize the first PDF page with pypdfium2"""
+        pdf = pdfium.PdfDocument(input_path)
         try:
-            from pdf2image import convert_from_path
-            
-            images = convert_from_path(input_path, dpi=150, first_page=1, last_page=1)
-            if images:
-                output_path = os.path.splitext(input_path)[0] + f'_page1.{output_format}'
-                images[0].save(output_path, output_format.upper())
-                return output_path
-            else:
+            if not len(pdf):
                 raise Exception("No pages found in PDF")
-                
-        except ImportError:
-            # Use PyMuPDF as fallback
-            try:
-                import fitz
-                doc = fitz.open(input_path)
-                page = doc[0]
-                pix = page.get_pixmap()
-                output_path = os.path.splitext(input_path)[0] + f'_page1.{output_format}'
-                pix.save(output_path)
-                return output_path
-            except ImportError:
-                raise Exception("PDF to image conversion requires pdf2image or PyMuPDF")
+            image = pdf[0].render(scale=dpi / 72).to_pil()
+        finally:
+            pdf.close()
+        
+        output_path = os.path.splitext(input_path)[0] + f'_page1.{output_format}'
+        return self._save_page_image(image, output_path, output_format)
+    
+    def _save_page_image(self, image, output_path: str, output_format: str) -> str:
+        """Save a rendered PDF page with encoder options suited to the format"""
+        output_format = output_format.lower()
+        if output_format in ['jpg', 'jpeg']:
+            # Optimized Huffman tables + progressive scan give smaller JPEGs
+            image.save(output_path, format='JPEG', quality=90, optimize=True, progressive=True)
+        elif output_format == 'png':
+            # PNG ignores quality; optimize=True would force the slowest zlib level
+            image.save(output_path, format='PNG', compress_level=6)
+        else:
+            image.save(output_path, format=output_format.upper())
+        return output_path
+    
+    def _encode_pixmap_jpeg(self, pix, quality: int = 85) -> bytes:
+        """Encode a PyMuPDF pixmap as JPEG, using libjpeg-turbo when available"""
+        if HAVE_SIMPLEJPEG and pix.n == 3 and not pix.alpha:
+            # Raw RGB samples go straight to TurboJPEG, no PIL image in between
+            pixels = np.frombuffer(pix.samples_mv, dtype=np.uint8).reshape(pix.height, pix.stride)
+            pixels = pixels[:, :pix.width * 3].reshape(pix.height, pix.width, 3)
+            return simplejpeg.encode_jpeg(np.ascontiguousarray(pixels), quality=quality, colorspace='RGB')
+        return pix.pil_tobytes(format='JPEG', optimize=False, quality=quality)
     
     async def _convert_xlsx_to_csv(self, input_path: str, output_path: str) -> str:
         """Convert Excel to CSV"""
-        try:
-            import pandas as pd
-            
-            # Read first sheet
-            df = pd.read_excel(input_path)
-            df.to_csv(output_path, index=False)
-            return output_path
-            
-        except ImportError:
+        if CalamineWorkbook is not None:
+            # Rows go straight from calamine's Rust reader to csv.writer - no DataFrame
+            try:
+                return await asyncio.to_thread(self._calamine_xlsx_to_csv, input_path, output_path)
+            except Exception as e:
+                logger.warning(f"calamine XLSX read failed, trying polars/pandas: {e}")
+        
+        if pl is not None:
+            # calamine parses XLSX in Rust, far faster than openpyxl's XML walk
+            try:
+                await asyncio.to_thread(self._polars_xlsx_to_csv, input_path, output_path)
+                return output_path
+            except Exception as e:
+                logger.warning(f"polars XLSX read failed, trying pandas: {e}")
+        
+        if pd is None:
             return await self._convert_with_libreoffice(input_path, output_path, 'csv')
+        
+        # Read first sheet
+        df = await asyncio.to_thread(pd.read_excel, input_path)
+        await asyncio.to_thread(df.to_csv, output_path, index=False)
+        return output_path
     
     async def _convert_csv_to_xlsx(self, input_path: str, output_path: str) -> str:
         """Convert CSV to Excel"""
-        try:
-            import pandas as pd
-            
-            df = pd.read_csv(input_path)
-            df.to_excel(output_path, index=False)
-            return output_path
-            
-        except ImportError:
+        if xlsxwriter is not None:
+            try:
+                return await asyncio.to_thread(self._xlsxwriter_csv_to_xlsx, input_path, output_path)
+            except Exception as e:
+                logger.warning(f"xlsxwriter XLSX write failed, trying polars/pandas: {e}")
+        
+        if pl is not None:
+            try:
+                await asyncio.to_thread(self._polars_csv_to_xlsx, input_path, output_path)
+                return output_path
+            except Exception as e:
+                logger.warning(f"polars XLSX write failed, trying pandas: {e}")
+        
+        if pd is None:
             return await self._convert_with_libreoffice(input_path, output_path, 'xlsx')
+        
+        df = await asyncio.to_thread(pd.read_csv, input_path)
+        await asyncio.to_thread(df.to_excel, output_path, index=False)
+        return output_path
+    
+    def _calamine_xlsx_to_csv(self, input_path: str, output_path: str) -> str:
+        """Stream the first sheet's rows into a CSV file"""
+        sheet = CalamineWorkbook.from_path(input_path).get_sheet_by_index(0)
+        with open(output_path, 'w', newline='', encoding='utf-8', buffering=WRITE_BUFFER_SIZE) as f:
+            # XLSX stores every number as a float; write whole ones as 1, not 1.0, like pandas did
+            csv.writer(f).writerows(
+                [int(v) if isinstance(v, float) and v.is_integer() else v for v in row]
+                for row in sheet.iter_rows()
+            )
+        return output_path
+    
+    def _xlsxwriter_csv_to_xlsx(self, input_path: str, output_path: str) -> str:
+        """Stream CSV rows into a worksheet, writing numbers as numbers like pandas did"""
+        workbook = xlsxwriter.Workbook(output_path, {'constant_memory': True, 'strings_to_numbers': True})
+        try:
+            worksheet = workbook.add_worksheet()
+            with open(input_path, newline='', encoding='utf-8') as f:
+                for row_num, row in enumerate(csv.reader(f)):
+                    worksheet.write_row(row_num, 0, row)
+        finally:
+            workbook.close()
+        return output_path
+    
+    def _polars_xlsx_to_csv(self, input_path: str, output_path: str):
+        """Read the first sheet with calamine and write it as CSV"""
+        pl.read_excel(input_path, engine='calamine').write_csv(output_path)
+    
+    def _polars_csv_to_xlsx(self, input_path: str, output_path: str):
+        """Read CSV with polars and write it through xlsxwriter"""
+        pl.read_csv(input_path).write_excel(output_path)
+    
+    def _write_txt_html(self, input_path: str, output_path: str) -> str:
+        """Stream escaped text between the precomputed HTML head and tail"""
+        with open(input_path, 'r', encoding='utf-8') as src, \
+                open(output_path, 'w', encoding='utf-8', buffering=WRITE_BUFFER_SIZE) as dst:
+            dst.write(_TXT_HTML_HEAD)
+            # Escaping is per character, so chunk boundaries need no special handling
+            for chunk in iter(lambda: src.read(WRITE_BUFFER_SIZE), ''):
+                dst.write(chunk.translate(_ESCAPE_TABLE))
+            dst.write(_TXT_HTML_TAIL)
+        return output_path
     
     async def _convert_txt_to_html(self, input_path: str, output_path: str) -> str:
         """Convert text to HTML"""
         try:
-            async with aiofiles.open(input_path, 'r', encoding='utf-8') as f:
-                text = await f.read()
-            
-            html_content = f"""<!DOCTYPE html>
-<html>
-<head>
-    <meta charset="UTF-8">
-    <title>Converted Document</title>
-</head>
-<body>
-    <pre>{text}</pre>
-</body>
-</html>"""
-            
-            async with aiofiles.open(output_path, 'w', encoding='utf-8') as f:
-                await f.write(html_content)
-            return output_path
+            return await asyncio.to_thread(self._write_txt_html, input_path, output_path)
         except Exception as e:
             raise Exception(f"Text to HTML conversion failed: {str(e)}")
     
@@ -234,77 +932,167 @@ class DocumentConverter:
         """Universal conversion using LibreOffice with better error handling"""
         try:
             # Check if LibreOffice is available
-            result = await self._run_command(['which', 'libreoffice'])
-            if not result.strip():
+            if self._libreoffice_path is None:
                 raise Exception("LibreOffice is not installed")
             
-            cmd = [
-                'libreoffice', '--headless', '--convert-to', output_format,
-                '--outdir', os.path.dirname(output_path), input_path
-            ]
-            
-            await self._run_command(cmd)
-            
-            # Find the converted file
-            base_name = os.path.splitext(os.path.basename(input_path))[0]
-            expected_ext = '.' + output_format
-            possible_path = os.path.join(os.path.dirname(output_path), base_name + expected_ext)
-            
-            if os.path.exists(possible_path):
-                if possible_path != output_path:
-                    os.rename(possible_path, output_path)
-                return output_path
-            else:
-                # Try with different extensions
-                for ext in [output_format, 'pdf', 'docx', 'txt']:
-                    possible_path = os.path.join(os.path.dirname(output_path), base_name + '.' + ext)
-                    if os.path.exists(possible_path):
-                        if possible_path != output_path:
-                            os.rename(possible_path, output_path)
+            # Reuse a warm listener; a cold start costs seconds per call
+            if office_pool.available:
+                try:
+                    async with office_pool.acquire() as connection:
+                        await self._run_command([
+                            'unoconv', '--connection', connection,
+                            '-f', output_format, '-o', output_path, input_path
+                        ])
+                    if os.path.exists(output_path):
                         return output_path
-                
-                raise Exception("LibreOffice conversion failed - output not found")
+                except Exception as e:
+                    logger.warning(f"LibreOffice listener conversion failed, starting a fresh instance: {e}")
+            
+            return await self._convert_with_libreoffice_batched(input_path, output_path, output_format)
                 
         except Exception as e:
             logger.error(f"LibreOffice conversion error: {e}")
             raise Exception(f"Conversion to {output_format} failed: {str(e)}")
     
+    async def convert_documents_batch(self, jobs: List[tuple]) -> list:
+        """Convert several (input_path, output_format) jobs; LibreOffice work is batched"""
+        self._lo_batch_callers += 1
+        try:
+            return await asyncio.gather(*[
+                self.convert_document(input_path, output_format) for input_path, output_format in jobs
+            ])
+        finally:
+            self._lo_batch_callers -= 1
+    
+    async def _convert_with_libreoffice_batched(self, input_path: str, output_path: str, output_format: str) -> str:
+        """Queue a cold LibreOffice conversion so concurrent requests share one soffice start"""
+        loop = asyncio.get_running_loop()
+        future = loop.create_future()
+        pending = self._lo_pending.setdefault(output_format, [])
+        pending.append((input_path, output_path, future))
+        if len(pending) == 1:
+            # Only wait for company while a batch is in flight; a lone request flushes right away
+            delay = LIBREOFFICE_BATCH_WINDOW if self._lo_batch_callers else 0
+            loop.call_later(delay, self._schedule_libreoffice_flush, output_format)
+        return await future
+    
+    def _schedule_libreoffice_flush(self, output_format: str):
+        """Start flushing a batch, keeping a reference to the task until it finishes"""
+        task = asyncio.ensure_future(self._flush_libreoffice_batch(output_format))
+        self._lo_flush_tasks.add(task)
+        task.add_done_callback(self._lo_flush_tasks.discard)
+    
+    async def _flush_libreoffice_batch(self, output_format: str):
+        """Run queued jobs, splitting batches so no two inputs share a file name"""
+        jobs = self._lo_pending.pop(output_format, [])
+        while jobs:
+            batch, rest, stems = [], [], set()
+            for job in jobs:
+                stem = os.path.splitext(os.path.basename(job[0]))[0]
+                (rest if stem in stems else batch).append(job)
+                stems.add(stem)
+            jobs = rest
+            await self._run_libreoffice_batch(batch, output_format)
+    
+    async def _run_libreoffice_batch(self, jobs: list, output_format: str):
+        """Convert many files with a single LibreOffice process and resolve each caller"""
+        try:
+            # A private outdir holds exactly this batch's output
+            with tempfile.TemporaryDirectory(dir=os.path.dirname(jobs[0][1]) or '.') as out_dir:
+                cmd = [
+                    self._libreoffice_path, '--headless', '--convert-to', output_format,
+                    '--outdir', out_dir, *[input_path for input_path, _, _ in jobs]
+                ]
+                
+                # One bad file fails the exit code; still collect whatever was produced
+                error = None
+                try:
+                    await self._run_command(cmd)
+                except Exception as e:
+                    error = e
+                
+                produced = {os.path.splitext(name)[0]: name for name in os.listdir(out_dir)}
+                for input_path, output_path, future in jobs:
+                    if future.done():
+                        continue
+                    name = produced.get(os.path.splitext(os.path.basename(input_path))[0])
+                    if name is None:
+                        future.set_exception(error or Exception("LibreOffice conversion failed - output not found"))
+                    else:
+                        # out_dir sits beside the first job only; other outputs may be on another filesystem
+                        shutil.move(os.path.join(out_dir, name), output_path)
+                        future.set_result(output_path)
+        except Exception as e:
+            for _, _, future in jobs:
+                if not future.done():
+                    future.set_exception(e)
+    
     async def convert_images_to_pdf(self, image_paths: List[str], output_path: str) -> str:
         """Convert multiple images to PDF"""
+        if img2pdf is not None:
+            return await asyncio.to_thread(self._write_images_pdf, image_paths, output_path)
+        
+        # Use PIL as fallback - decodes and re-encodes every image
+        if Image is None:
+            raise Exception("Image to PDF conversion requires img2pdf or PIL")
+        if not image_paths:
+            raise Exception("No images to convert")
+        
+        return await asyncio.to_thread(self._write_images_pdf_pil, image_paths, output_path)
+    
+    def _write_images_pdf(self, image_paths: List[str], output_path: str) -> str:
+        """Stream the PDF from img2pdf to disk, flattening only images it rejects"""
         try:
-            import img2pdf
-            
-            with open(output_path, "wb") as f:
-                f.write(img2pdf.convert(image_paths))
+            # JPEG/PNG data is embedded as-is - no decode or re-encode
+            with open(output_path, 'wb') as f:
+                img2pdf.convert(image_paths, outputstream=f)
             return output_path
-                
-        except ImportError:
-            # Use PIL as fallback
-            try:
-                from PIL import Image
-                
-                images = []
-                for img_path in image_paths:
-                    img = Image.open(img_path)
-                    if img.mode != 'RGB':
-                        img = img.convert('RGB')
-                    images.append(img)
-                
-                if images:
-                    images[0].save(output_path, save_all=True, append_images=images[1:])
-                    return output_path
+        except img2pdf.AlphaChannelError:
+            if Image is None:
+                raise
+        
+        with open(output_path, 'wb') as f:
+            img2pdf.convert(self._flatten_alpha_images(image_paths), outputstream=f)
+        return output_path
+    
+    def _write_images_pdf_pil(self, image_paths: List[str], output_path: str) -> str:
+        """Build the PDF with PIL, streaming it through one large write buffer"""
+        def rgb_pages():
+            for img_path in image_paths[1:]:
+                # Decode before the source file is closed
+                with Image.open(img_path) as img:
+                    img.load()
+                    yield img if img.mode == 'RGB' else img.convert('RGB')
+        
+        with Image.open(image_paths[0]) as first:
+            if first.mode != 'RGB':
+                first = first.convert('RGB')
+            with open(output_path, 'wb', buffering=WRITE_BUFFER_SIZE) as f:
+                first.save(f, format='PDF', save_all=True, append_images=rgb_pages())
+        return output_path
+    
+    def _flatten_alpha_images(self, image_paths: List[str]) -> list:
+        """Replace images with transparency by in-memory RGB PNGs"""
+        sources = []
+        for img_path in image_paths:
+            with Image.open(img_path) as img:
+                if img.mode in ('RGBA', 'LA') or (img.mode == 'P' and 'transparency' in img.info):
+                    buffer = BytesIO()
+                    img.convert('RGB').save(buffer, format='PNG')
+                    sources.append(buffer.getvalue())
                 else:
-                    raise Exception("No images to convert")
-            except ImportError:
-                raise Exception("Image to PDF conversion requires img2pdf or PIL")
+                    sources.append(img_path)
+        return sources
     
-    async def _run_command(self, cmd: List[str]) -> str:
+    async def _run_command(self, cmd: List[str], capture_stdout: bool = False) -> str:
         """Run system command asynchronously"""
         try:
+            # stdout is discarded unless asked for; stderr is kept for error messages
             process = await asyncio.create_subprocess_exec(
                 *cmd,
-                stdout=asyncio.subprocess.PIPE,
-                stderr=asyncio.subprocess.PIPE
+                stdout=asyncio.subprocess.PIPE if capture_stdout else asyncio.subprocess.DEVNULL,
+                stderr=asyncio.subprocess.PIPE,
+                start_new_session=True
             )
             
             stdout, stderr = await process.communicate()
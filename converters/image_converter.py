@@ -1,20 +1,248 @@
 import os
 import asyncio
+import atexit
 import logging
+import multiprocessing
+import shutil
 import subprocess
-from PIL import Image, ImageFilter, ImageEnhance
+from io import BytesIO
+from functools import partial
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
+from PIL import Image, ImageChops, ImageFilter, ImageEnhance, features
 import aiofiles
 
 logger = logging.getLogger(__name__)
 
+# Whether Pillow's own JPEG codec is the SIMD libjpeg-turbo build (official wheels are)
+HAVE_LIBJPEG_TURBO = bool(features.check_feature('libjpeg_turbo'))
+
+# libjpeg-turbo's SIMD encoder, when PyTurboJPEG and the shared library are both present
+try:
+    import numpy as np
+    from turbojpeg import TurboJPEG, TJPF_RGB, TJSAMP_420
+    _turbo_jpeg = TurboJPEG()
+except (ImportError, OSError, RuntimeError):
+    _turbo_jpeg = None
+
+# JPEG->JPEG re-encodes at least this large skip Pillow entirely when TurboJPEG is available
+TURBO_RECODE_PIXELS = 1920 * 1080
+
+# MagickWand bindings let ImageMagick run inside the worker processes instead of forking `convert`
+try:
+    from wand.image import Image as WandImage
+except ImportError:
+    WandImage = None
+
+# Pillow work runs in worker processes so a large decode never blocks the event loop
+IMAGE_WORKERS = int(os.environ.get('IMAGE_WORKERS', min(os.cpu_count() or 1, 4)))
+_image_pool = ProcessPoolExecutor(
+    max_workers=IMAGE_WORKERS,
+    # forkserver children don't inherit locks held by the bot's to_thread workers
+    mp_context=multiprocessing.get_context(
+        'forkserver' if 'forkserver' in multiprocessing.get_all_start_methods() else 'spawn'
+    )
+)
+atexit.register(_image_pool.shutdown)
+
+# A single image this large is resampled in horizontal stripes on several threads
+STRIPE_RESIZE_PIXELS = 8_000_000
+RESIZE_STRIPES = min(os.cpu_count() or 1, 4)
+
+# Pillow's default ICO frame sizes
+ICO_SIZES = [(16, 16), (24, 24), (32, 32), (48, 48), (64, 64), (128, 128), (256, 256)]
+
+def _target_size(img, width: int = None, height: int = None) -> tuple:
+    """Work out the resize target, keeping the aspect ratio when one side is given"""
+    if width and height:
+        return (width, height)
+    elif width:
+        ratio = width / img.width
+        return (width, int(img.height * ratio))
+    elif height:
+        ratio = height / img.height
+        return (int(img.width * ratio), height)
+    raise Exception("Either width or height must be specified")
+
+def _apply_named_filter(img, filter_type: str):
+    """Apply one of the supported filters to an open image"""
+    if filter_type == 'blur':
+        # Separable (row then column box passes), unlike the fixed 5x5 BLUR kernel
+        return img.filter(ImageFilter.GaussianBlur(radius=2))
+    elif filter_type == 'sharpen':
+        return img.filter(ImageFilter.SHARPEN)
+    elif filter_type == 'grayscale':
+        return img.convert('L')
+    elif filter_type == 'emboss':
+        return img.filter(ImageFilter.EMBOSS)
+    elif filter_type == 'contour':
+        return img.filter(ImageFilter.CONTOUR)
+    elif filter_type == 'invert':
+        # One C pass over the pixels; alpha is carried over untouched
+        if img.mode == 'RGBA':
+            inverted = ImageChops.invert(img.convert('RGB'))
+            inverted.putalpha(img.getchannel('A'))
+            return inverted
+        if img.mode not in ('L', 'RGB'):
+            img = img.convert('RGB')
+        return ImageChops.invert(img)
+    raise Exception(f"Unknown filter: {filter_type}")
+
+def _prepare_mode(img, output_format: str):
+    """Bring the image into a mode the target format can store"""
+    # Handle transparency for JPEG
+    if output_format in ['jpg', 'jpeg'] and img.mode == 'P' and 'transparency' in img.info:
+        img = img.convert('RGBA')
+    if output_format in ['jpg', 'jpeg'] and img.mode == 'RGBA':
+        background = Image.new('RGB', img.size, (255, 255, 255))
+        background.paste(img, mask=img.getchannel('A'))
+        return background
+    if img.mode not in ('RGB', 'L') and output_format in ['jpg', 'jpeg']:
+        # Opaque palette and LA images go to RGB in a single pass
+        return img.convert('RGB')
+    if img.mode != 'RGB' and output_format == 'webp':
+        return img.convert('RGB')
+    return img
+
+def _resize_in_stripes(img, new_size: tuple):
+    """LANCZOS-resize output row stripes in threads; Pillow releases the GIL while resampling"""
+    img.load()
+    out_width, out_height = new_size
+    scale = img.height / out_height
+    step = -(-out_height // RESIZE_STRIPES)
+    
+    # Each stripe's box maps onto its source rows; the filter still reads the rows around it
+    def resize_stripe(top):
+        bottom = min(top + step, out_height)
+        box = (0, top * scale, img.width, bottom * scale)
+        return top, img.resize((out_width, bottom - top), Image.Resampling.LANCZOS, box=box)
+    
+    resized = Image.new(img.mode, new_size)
+    with ThreadPoolExecutor(max_workers=RESIZE_STRIPES) as pool:
+        for top, stripe in pool.map(resize_stripe, range(0, out_height, step)):
+            resized.paste(stripe, (0, top))
+    return resized
+
+def _save_ico(img, output_path: str):
+    """Save a square image as ICO, resizing its frames on threads instead of one after another"""
+    img.load()
+    sizes = [size for size in ICO_SIZES if size[0] <= img.width]
+    
+    # Pillow uses any appended image whose size matches a requested frame instead of resizing again
+    with ThreadPoolExecutor(max_workers=RESIZE_STRIPES) as pool:
+        frames = list(pool.map(lambda size: img.resize(size, Image.Resampling.LANCZOS), sizes))
+    img.save(output_path, format='ICO', sizes=sizes, append_images=frames)
+
+def _turbo_recode_jpeg(input_path: str, output_path: str, quality: int) -> bool:
+    """Decode and re-encode a large JPEG with TurboJPEG alone; False if Pillow should handle it"""
+    with open(input_path, 'rb') as f:
+        data = f.read()
+    try:
+        width, height, _, _ = _turbo_jpeg.decode_header(data)
+        if width * height < TURBO_RECODE_PIXELS:
+            return False
+        pixels = _turbo_jpeg.decode(data, pixel_format=TJPF_RGB)
+    except (OSError, ValueError):
+        # Not a baseline/progressive YCbCr or gray JPEG TurboJPEG can turn into RGB (e.g. CMYK)
+        return False
+    
+    del data
+    with open(output_path, 'wb') as f:
+        f.write(_turbo_jpeg.encode(pixels, quality=quality, pixel_format=TJPF_RGB, jpeg_subsample=TJSAMP_420))
+    return True
+
+def _transform_image(input_path: str, output_path: str, output_format: str, size: tuple = None,
+                     filter_type: str = None, rotate: int = None, quality: int = 85,
+                     optimize: bool = True) -> str:
+    """Decode once, apply resize/rotate/filter in memory and encode once - runs inside worker processes"""
+    output_format = output_format.lower()
+    if (_turbo_jpeg is not None and output_format in ['jpg', 'jpeg'] and not (size or filter_type or rotate)
+            and isinstance(input_path, str) and input_path.lower().endswith(('.jpg', '.jpeg'))
+            and _turbo_recode_jpeg(input_path, output_path, quality)):
+        return output_path
+    
+    with Image.open(input_path) as img:
+        # libjpeg can emit luma only, skipping colour conversion when the result is grayscale anyway
+        draft_mode = 'L' if filter_type == 'grayscale' else 'RGB'
+        draft_size = None
+        if size:
+            new_size = _target_size(img, *size)
+            # libjpeg can decode at 1/2, 1/4 or 1/8 scale; keep 2x the target for a clean LANCZOS pass
+            if new_size[0] < img.width and new_size[1] < img.height:
+                draft_size = (new_size[0] * 2, new_size[1] * 2)
+        if img.format == 'JPEG' and (draft_size or draft_mode == 'L'):
+            img.draft(draft_mode, draft_size or img.size)
+        
+        if size:
+            # Past 4x, box-reduce to within 2x of the target first; LANCZOS then only does the last step
+            reducing_gap = 2.0 if max(img.size) > 4 * max(new_size) else None
+            if (reducing_gap is None and RESIZE_STRIPES > 1 and img.mode in ('L', 'RGB', 'RGBA')
+                    and img.width * img.height >= STRIPE_RESIZE_PIXELS):
+                img = _resize_in_stripes(img, new_size)
+            else:
+                img = img.resize(new_size, Image.Resampling.LANCZOS, reducing_gap=reducing_gap)
+        if rotate:
+            img = img.rotate(rotate, expand=True)
+        if filter_type:
+            img = _apply_named_filter(img, filter_type)
+        
+        img = _prepare_mode(img, output_format)
+        
+        if _turbo_jpeg is not None and output_format in ['jpg', 'jpeg'] and img.mode == 'RGB':
+            # Same 4:2:0 subsampling Pillow uses at these qualities
+            data = _turbo_jpeg.encode(np.asarray(img), quality=quality, pixel_format=TJPF_RGB, jpeg_subsample=TJSAMP_420)
+            with open(output_path, 'wb') as f:
+                f.write(data)
+            return output_path
+        
+        if output_format == 'ico' and img.width == img.height and img.width > ICO_SIZES[0][0]:
+            _save_ico(img, output_path)
+            return output_path
+        
+        save_kwargs = {'optimize': optimize}
+        if output_format in ['jpg', 'jpeg', 'webp']:
+            save_kwargs['quality'] = quality
+        if output_format in ['jpg', 'jpeg']:
+            # Pin 4:2:0 so both JPEG encoders produce the same chroma layout
+            save_kwargs['subsampling'] = 2
+        
+        img.save(output_path, **save_kwargs)
+        return output_path
+
+def _convert_with_wand(input_path: str, output_path: str) -> str:
+    """Convert with ImageMagick in-process - runs inside worker processes"""
+    with WandImage(filename=input_path) as img:
+        img.format = os.path.splitext(output_path)[1].lstrip('.') or img.format
+        img.save(filename=output_path)
+    return output_path
+
+def _rasterize_svg(input_path: str, output_path: str, output_format: str) -> str:
+    """Render SVG to a raster format - runs inside worker processes"""
+    import cairosvg
+    if output_format.lower() == 'png':
+        cairosvg.svg2png(url=input_path, write_to=output_path)
+        return output_path
+    
+    # Other targets decode the in-memory PNG once; nothing intermediate touches the disk
+    return _transform_image(BytesIO(cairosvg.svg2png(url=input_path)), output_path, output_format)
+
 class ImageConverter:
     def __init__(self):
         self.supported_formats = ['png', 'jpg', 'jpeg', 'webp', 'bmp', 'tiff', 'gif', 'ico', 'svg']
+        
+        if not HAVE_LIBJPEG_TURBO:
+            logger.warning(
+                "Pillow is not linked against libjpeg-turbo; JPEG decode/encode will be several times slower. "
+                "Install the official Pillow wheel or rebuild Pillow against libjpeg-turbo"
+            )
     
     async def convert_format(self, input_path: str, output_format: str) -> str:
         """Convert image to different format"""
         try:
-            output_path = os.path.splitext(input_path)[0] + f'_converted.{output_format}'
+            output_path = self._derived_path(input_path, f'_converted.{output_format}')
+            
+            # GIF to GIF: hand back the bytes without decoding every frame; other formats still get re-encoded
+            if output_format.lower() == 'gif' and os.path.splitext(input_path)[1].lower() == '.gif':
+                return await asyncio.to_thread(self._link_or_copy, input_path, output_path)
             
             # Handle special formats
             if input_path.lower().endswith('.svg'):
@@ -29,23 +257,7 @@ class ImageConverter:
     async def _convert_with_pil(self, input_path: str, output_path: str, output_format: str) -> str:
         """Convert image using PIL"""
         try:
-            with Image.open(input_path) as img:
-                # Handle transparency for JPEG
-                if output_format.lower() in ['jpg', 'jpeg'] and img.mode in ('RGBA', 'LA'):
-                    background = Image.new('RGB', img.size, (255, 255, 255))
-                    background.paste(img, mask=img.split()[-1])
-                    img = background
-                elif img.mode != 'RGB' and output_format.lower() in ['jpg', 'jpeg', 'webp']:
-                    img = img.convert('RGB')
-                
-                # Save with optimization
-                save_kwargs = {'optimize': True}
-                if output_format.lower() in ['jpg', 'jpeg', 'webp']:
-                    save_kwargs['quality'] = 85
-                
-                img.save(output_path, **save_kwargs)
-                return output_path
-                
+            return await self._run_in_pool(partial(_transform_image, input_path, output_path, output_format))
         except Exception as e:
             logger.error(f"PIL conversion error: {e}")
             # Fallback to ImageMagick
@@ -54,23 +266,20 @@ class ImageConverter:
     async def _convert_svg(self, input_path: str, output_path: str, output_format: str) -> str:
         """Convert SVG to raster"""
         try:
-            import cairosvg
-            cairosvg.svg2png(url=input_path, write_to=output_path)
-            
-            # If target format is not PNG, convert again
-            if output_format.lower() != 'png':
-                intermediate_path = output_path
-                output_path = os.path.splitext(output_path)[0] + f'.{output_format}'
-                await self._convert_with_pil(intermediate_path, output_path, output_format)
-                os.remove(intermediate_path)
-            
-            return output_path
+            return await self._run_in_pool(_rasterize_svg, input_path, output_path, output_format)
         except ImportError:
             # Use ImageMagick as fallback
             return await self._convert_with_imagemagick(input_path, output_path)
     
     async def _convert_with_imagemagick(self, input_path: str, output_path: str) -> str:
         """Convert using ImageMagick as fallback"""
+        if WandImage is not None:
+            # Library and font caches stay warm in the pool workers between calls
+            try:
+                return await self._run_in_pool(_convert_with_wand, input_path, output_path)
+            except Exception as e:
+                logger.warning(f"Wand conversion failed, trying the convert CLI: {e}")
+        
         try:
             cmd = ['convert', input_path, output_path]
             await self._run_command(cmd)
@@ -82,69 +291,64 @@ class ImageConverter:
     async def apply_filter(self, input_path: str, filter_type: str) -> str:
         """Apply image filters"""
         try:
-            output_path = os.path.splitext(input_path)[0] + f'_{filter_type}.jpg'
+            output_path = self._derived_path(input_path, f'_{filter_type}.jpg')
+            
+            return await self._run_in_pool(partial(
+                _transform_image, input_path, output_path, 'jpg', filter_type=filter_type, optimize=False
+            ))
             
-            with Image.open(input_path) as img:
-                if filter_type == 'blur':
-                    filtered = img.filter(ImageFilter.BLUR)
-                elif filter_type == 'sharpen':
-                    filtered = img.filter(ImageFilter.SHARPEN)
-                elif filter_type == 'grayscale':
-                    filtered = img.convert('L')
-                elif filter_type == 'emboss':
-                    filtered = img.filter(ImageFilter.EMBOSS)
-                elif filter_type == 'contour':
-                    filtered = img.filter(ImageFilter.CONTOUR)
-                elif filter_type == 'invert':
-                    if img.mode == 'RGBA':
-                        r, g, b, a = img.split()
-                        r = Image.eval(r, lambda x: 255 - x)
-                        g = Image.eval(g, lambda x: 255 - x)
-                        b = Image.eval(b, lambda x: 255 - x)
-                        filtered = Image.merge('RGBA', (r, g, b, a))
-                    else:
-                        filtered = Image.eval(img, lambda x: 255 - x)
-                else:
-                    raise Exception(f"Unknown filter: {filter_type}")
-                
-                filtered.save(output_path, 'JPEG', quality=85)
-                return output_path
-                
         except Exception as e:
             logger.error(f"Filter application error: {e}")
             raise Exception(f"Failed to apply {filter_type} filter")
     
     async def compress_image(self, input_path: str, quality: int = 75) -> str:
         """Compress image"""
-        output_path = os.path.splitext(input_path)[0] + '_compressed.jpg'
+        output_path = self._derived_path(input_path, '_compressed.jpg')
         
-        with Image.open(input_path) as img:
-            if img.mode != 'RGB':
-                img = img.convert('RGB')
-            img.save(output_path, 'JPEG', optimize=True, quality=quality)
-        
-        return output_path
+        return await self._run_in_pool(partial(_transform_image, input_path, output_path, 'jpg', quality=quality))
     
     async def resize_image(self, input_path: str, width: int = None, height: int = None) -> str:
         """Resize image"""
-        output_path = os.path.splitext(input_path)[0] + '_resized.jpg'
+        output_path = self._derived_path(input_path, '_resized.jpg')
         
-        with Image.open(input_path) as img:
-            if width and height:
-                new_size = (width, height)
-            elif width:
-                ratio = width / img.width
-                new_size = (width, int(img.height * ratio))
-            elif height:
-                ratio = height / img.height
-                new_size = (int(img.width * ratio), height)
-            else:
-                raise Exception("Either width or height must be specified")
+        return await self._run_in_pool(partial(
+            _transform_image, input_path, output_path, 'jpg', size=(width, height), optimize=False
+        ))
+    
+    async def transform(self, input_path: str, output_format: str = 'jpg', width: int = None, height: int = None,
+                        filter_type: str = None, rotate: int = None, quality: int = 85) -> str:
+        """Resize, rotate, filter and convert in one decode/encode pass"""
+        try:
+            output_path = self._derived_path(input_path, f'_transformed.{output_format}')
+            size = (width, height) if width or height else None
             
-            resized = img.resize(new_size, Image.Resampling.LANCZOS)
-            resized.save(output_path, 'JPEG', quality=85)
-        
-        return output_path
+            return await self._run_in_pool(partial(
+                _transform_image, input_path, output_path, output_format,
+                size=size, filter_type=filter_type, rotate=rotate, quality=quality
+            ))
+            
+        except Exception as e:
+            logger.error(f"Image transform error: {e}")
+            raise Exception(f"Image transform to {output_format} failed: {str(e)}")
+    
+    @staticmethod
+    def _link_or_copy(source_path: str, target_path: str) -> str:
+        """Hard-link a file (no data copied), falling back to a copy across filesystems"""
+        try:
+            os.link(source_path, target_path)
+        except OSError:
+            shutil.copy2(source_path, target_path)
+        return target_path
+    
+    @staticmethod
+    def _derived_path(input_path: str, suffix: str) -> str:
+        """Build an output path next to the input; splitext also copes with extensionless names"""
+        return os.path.splitext(input_path)[0] + suffix
+    
+    async def _run_in_pool(self, func, *args):
+        """Run a Pillow helper in the shared image worker pool"""
+        loop = asyncio.get_running_loop()
+        return await loop.run_in_executor(_image_pool, func, *args)
     
     async def _run_command(self, cmd: list) -> str:
         """Run system command"""
@@ -1,19 +1,165 @@
 import os
 import asyncio
+import atexit
+import importlib
+import multiprocessing
+import shutil
 import subprocess
 import tempfile
+import zipfile
+from io import BytesIO
 from pathlib import Path
+from concurrent.futures import ProcessPoolExecutor
+from functools import lru_cache
 import logging
+import aiofiles
 from config import Config
 
 logger = logging.getLogger(__name__)
 
+# WordprocessingML namespace prefix for DOCX XML tags
+_W = '{http://schemas.openxmlformats.org/wordprocessingml/2006/main}'
+
+# Marks an optional module that failed to import
+_MISSING = object()
+
+@lru_cache(maxsize=None)
+def _load_module(name):
+    """Import a heavy optional module once; failures are remembered too"""
+    try:
+        return importlib.import_module(name)
+    except ImportError:
+        return _MISSING
+
+def _require(name):
+    """Return a cached optional module, raising ImportError if it is unavailable"""
+    module = _load_module(name)
+    if module is _MISSING:
+        raise ImportError(f"{name} is not installed")
+    return module
+
+# CPU-bound Pillow/Poppler work (page ranges, image re-encodes) runs here; workers start on first use
+PDF_RENDER_WORKERS = min(os.cpu_count() or 1, 4)
+# Workers are forked from a clean server process, not from the bot while its threads may hold locks
+_POOL_START_METHOD = 'forkserver' if 'forkserver' in multiprocessing.get_all_start_methods() else 'spawn'
+_render_pool = ProcessPoolExecutor(
+    max_workers=PDF_RENDER_WORKERS, mp_context=multiprocessing.get_context(_POOL_START_METHOD)
+)
+atexit.register(_render_pool.shutdown)
+
+def _save_image_as(input_path, output_path, output_format):
+    """Re-encode an image with professional settings - runs inside worker processes"""
+    from PIL import Image
+    
+    with Image.open(input_path) as img:
+        # Handle format-specific conversions with professional settings
+        if output_format in ['jpg', 'jpeg']:
+            # Professional JPEG conversion
+            if img.mode in ('RGBA', 'LA', 'P'):
+                if img.mode == 'P' and 'transparency' in img.info:
+                    img = img.convert('RGBA')
+                background = Image.new('RGB', img.size, (255, 255, 255))
+                if img.mode == 'RGBA':
+                    background.paste(img, mask=img.getchannel('A'))
+                else:
+                    background.paste(img)
+                img = background
+            elif img.mode != 'RGB':
+                img = img.convert('RGB')
+            
+            # High quality JPEG save
+            img.save(output_path, 'JPEG', quality=95, optimize=True, progressive=True)
+            
+        elif output_format == 'png':
+            # High quality PNG with optimization
+            if img.mode == 'P':
+                img = img.convert('RGBA')
+            img.save(output_path, 'PNG', optimize=True)
+            
+        elif output_format == 'bmp':
+            # BMP conversion
+            if img.mode != 'RGB':
+                img = img.convert('RGB')
+            img.save(output_path, 'BMP')
+            
+        else:
+            # Fallback for other formats
+            img.save(output_path, format=output_format.upper())
+    
+    return output_path
+
+# Hardware H.264 encoders in probe order: (decode args before -i, encode args matching libx264 -crf 23)
+_HW_H264_ENCODERS = {
+    'h264_nvenc': (['-hwaccel', 'cuda'], ['-c:v', 'h264_nvenc', '-preset', 'p4', '-rc', 'vbr', '-cq', '23', '-b:v', '0']),
+    'h264_qsv': ([], ['-c:v', 'h264_qsv', '-preset', 'medium', '-global_quality', '23']),
+}
+_SOFTWARE_H264 = ([], ['-c:v', 'libx264', '-preset', 'medium', '-crf', '23'])
+
+# Page formats Poppler can write itself, with the JPEG settings used by _save_page_image
+_POPPLER_FORMATS = {'jpg': 'jpeg', 'jpeg': 'jpeg', 'png': 'png', 'tiff': 'tiff'}
+_POPPLER_JPEG_OPTIONS = {'quality': 90, 'progressive': True, 'optimize': True}
+
+def _render_pdf_page_range(input_path, first_page, last_page, dpi, output_stem, output_format):
+    """Render and save PDF pages [first_page, last_page] - runs inside worker processes"""
+    convert_from_path = _require('pdf2image').convert_from_path
+    
+    paths = []
+    poppler_format = _POPPLER_FORMATS.get(output_format)
+    if poppler_format:
+        # pdftocairo writes the target format directly - no PIL decode/encode per page
+        with tempfile.TemporaryDirectory(dir=os.path.dirname(output_stem) or '.') as render_dir:
+            rendered = convert_from_path(
+                input_path, dpi=dpi, first_page=first_page, last_page=last_page,
+                output_folder=render_dir, fmt=poppler_format, use_pdftocairo=True, paths_only=True,
+                jpegopt=_POPPLER_JPEG_OPTIONS if poppler_format == 'jpeg' else None
+            )
+            for page_num, rendered_path in enumerate(rendered, first_page):
+                img_path = f"{output_stem}_page_{page_num}.{output_format}"
+                os.replace(rendered_path, img_path)
+                paths.append(img_path)
+        return paths
+    
+    # Saving in the worker means only file paths cross the process boundary
+    images = convert_from_path(input_path, dpi=dpi, first_page=first_page, last_page=last_page)
+    for page_num, image in enumerate(images, first_page):
+        img_path = f"{output_stem}_page_{page_num}.{output_format}"
+        UniversalConverter._save_page_image(image, img_path, output_format)
+        paths.append(img_path)
+    return paths
+
 class UniversalConverter:
     def __init__(self):
         self.supported_formats = {}
         for category, formats in Config.SUPPORTED_FORMATS.items():
             for fmt in formats:
                 self.supported_formats[fmt] = category
+        
+        # Hardware H.264 encoder found by the one-time probe (None means libx264)
+        self._hw_encoder = None
+        self._hw_encoder_probed = False
+    
+    async def _hardware_h264_encoder(self):
+        """Pick a working hardware H.264 encoder once and remember it"""
+        if self._hw_encoder_probed:
+            return self._hw_encoder
+        self._hw_encoder_probed = True
+        if Config.VIDEO_HW_ACCEL == 'off':
+            return None
+        
+        for encoder in _HW_H264_ENCODERS:
+            # ffmpeg lists NVENC/QSV even without a usable GPU, so encode one test frame
+            try:
+                await self._run_command([
+                    'ffmpeg', '-hide_banner', '-loglevel', 'error',
+                    '-f', 'lavfi', '-i', 'color=size=256x256', '-frames:v', '1',
+                    '-c:v', encoder, '-f', 'null', '-'
+                ], timeout=15)
+            except Exception:
+                continue
+            logger.info(f"Using {encoder} for H.264 video encoding")
+            self._hw_encoder = encoder
+            break
+        return self._hw_encoder
     
     async def _check_ffmpeg_available(self):
         """Check if FFmpeg is available"""
@@ -66,53 +212,19 @@ class UniversalConverter:
     async def _convert_image(self, input_path, output_format, input_extension):
         """Professional image conversion with high quality"""
         try:
-            from PIL import Image, ImageSequence
-            
             output_path = input_path.rsplit('.', 1)[0] + f'.{output_format}'
             
             # Handle GIF conversions specially
             if input_extension == 'gif' or output_format == 'gif':
                 return await self._convert_gif_advanced(input_path, output_path, input_extension, output_format)
             
-            with Image.open(input_path) as img:
-                # Handle format-specific conversions with professional settings
-                if output_format in ['jpg', 'jpeg']:
-                    # Professional JPEG conversion
-                    if img.mode in ('RGBA', 'LA', 'P'):
-                        if img.mode == 'P' and 'transparency' in img.info:
-                            img = img.convert('RGBA')
-                        background = Image.new('RGB', img.size, (255, 255, 255))
-                        if img.mode == 'RGBA':
-                            background.paste(img, mask=img.split()[-1])
-                        else:
-                            background.paste(img)
-                        img = background
-                    elif img.mode != 'RGB':
-                        img = img.convert('RGB')
-                    
-                    # High quality JPEG save
-                    img.save(output_path, 'JPEG', quality=95, optimize=True, progressive=True)
-                    
-                elif output_format == 'png':
-                    # High quality PNG with optimization
-                    if img.mode == 'P':
-                        img = img.convert('RGBA')
-                    img.save(output_path, 'PNG', optimize=True)
-                    
-                elif output_format == 'bmp':
-                    # BMP conversion
-                    if img.mode != 'RGB':
-                        img = img.convert('RGB')
-                    img.save(output_path, 'BMP')
-                    
-                elif output_format == 'pdf':
-                    # Professional image to PDF conversion
-                    return await self._image_to_pdf_advanced(input_path, output_path)
-                else:
-                    # Fallback for other formats
-                    img.save(output_path, format=output_format.upper())
-                
-                return output_path
+            if output_format == 'pdf':
+                # Professional image to PDF conversion
+                return await self._image_to_pdf_advanced(input_path, output_path)
+            
+            # Decode and re-encode off the event loop, one core per concurrent conversion
+            loop = asyncio.get_running_loop()
+            return await loop.run_in_executor(_render_pool, _save_image_as, input_path, output_path, output_format)
                 
         except Exception as e:
             logger.error(f"Image conversion error: {e}")
@@ -121,7 +233,10 @@ class UniversalConverter:
     async def _convert_gif_advanced(self, input_path, output_path, input_ext, output_format):
         """Advanced GIF conversion with optimized quality and performance"""
         try:
-            from PIL import Image, ImageSequence, ImageEnhance
+            # GIF to GIF: nothing to decode, but the result still needs its own file
+            if input_ext == 'gif' and output_format == 'gif':
+                output_path = input_path.rsplit('.', 1)[0] + '_converted.gif'
+                return await asyncio.to_thread(self._link_or_copy, input_path, output_path)
             
             # Handle GIF to other formats conversion
             if input_ext == 'gif' and output_format != 'gif':
@@ -140,43 +255,56 @@ class UniversalConverter:
     async def _convert_gif_to_static(self, input_path, output_path, output_format):
         """Convert animated GIF to static image formats"""
         try:
-            from PIL import Image, ImageSequence
-            
-            with Image.open(input_path) as img:
-                # Extract first frame for static conversion
-                first_frame = None
-                for frame in ImageSequence.Iterator(img):
-                    first_frame = frame.copy()
-                    break
+            if output_format == 'pdf':
+                return await self._image_to_pdf_advanced(input_path, output_path)
+            
+            return await asyncio.to_thread(self._write_gif_first_frame, input_path, output_path, output_format)
                 
-                if not first_frame:
-                    raise Exception("No frames found in GIF")
+        except Exception as e:
+            raise Exception(f"GIF to {output_format} conversion failed: {str(e)}")
+
+    def _link_or_copy(self, source_path, target_path):
+        """Hard-link a file (no data copied), falling back to a copy across filesystems"""
+        try:
+            os.link(source_path, target_path)
+        except OSError:
+            shutil.copyfile(source_path, target_path)
+        return target_path
+    
+    def _write_gif_first_frame(self, input_path, output_path, output_format):
+        """Save a GIF's first frame in a static format"""
+        from PIL import Image, ImageSequence
+        
+        with Image.open(input_path) as img:
+            # Extract first frame for static conversion
+            first_frame = None
+            for frame in ImageSequence.Iterator(img):
+                first_frame = frame.copy()
+                break
+            
+            if not first_frame:
+                raise Exception("No frames found in GIF")
+            
+            # Handle format-specific conversions
+            if output_format in ['jpg', 'jpeg']:
+                if first_frame.mode != 'RGB':
+                    first_frame = first_frame.convert('RGB')
+                first_frame.save(output_path, 'JPEG', quality=95, optimize=True)
                 
-                # Handle format-specific conversions
-                if output_format in ['jpg', 'jpeg']:
-                    if first_frame.mode != 'RGB':
-                        first_frame = first_frame.convert('RGB')
-                    first_frame.save(output_path, 'JPEG', quality=95, optimize=True)
-                    
-                elif output_format == 'png':
-                    if first_frame.mode == 'P':
-                        first_frame = first_frame.convert('RGBA')
-                    first_frame.save(output_path, 'PNG', optimize=True)
-                    
-                elif output_format == 'bmp':
-                    if first_frame.mode != 'RGB':
-                        first_frame = first_frame.convert('RGB')
-                    first_frame.save(output_path, 'BMP')
-                    
-                elif output_format == 'pdf':
-                    return await self._image_to_pdf_advanced(input_path, output_path)
-                else:
-                    first_frame.save(output_path, format=output_format.upper())
+            elif output_format == 'png':
+                if first_frame.mode == 'P':
+                    first_frame = first_frame.convert('RGBA')
+                first_frame.save(output_path, 'PNG', optimize=True)
                 
-                return output_path
+            elif output_format == 'bmp':
+                if first_frame.mode != 'RGB':
+                    first_frame = first_frame.convert('RGB')
+                first_frame.save(output_path, 'BMP')
                 
-        except Exception as e:
-            raise Exception(f"GIF to {output_format} conversion failed: {str(e)}")
+            else:
+                first_frame.save(output_path, format=output_format.upper())
+            
+            return output_path
 
     async def _convert_to_animated_gif(self, input_path, output_path, input_ext):
         """Convert various formats to animated GIF"""
@@ -198,57 +326,61 @@ class UniversalConverter:
     async def _convert_image_to_animated_gif(self, input_path, output_path):
         """Convert static image to animated GIF with effects"""
         try:
-            from PIL import Image, ImageEnhance, ImageFilter
+            await asyncio.to_thread(self._write_animated_gif, input_path, output_path)
             
-            with Image.open(input_path) as img:
-                # Convert to RGB if necessary
-                if img.mode != 'RGB':
-                    img = img.convert('RGB')
-                
-                frames = []
-                total_frames = 15  # Reduced frames for better performance
-                base_duration = 150  # Base duration in ms
-                
-                # Create different variations for animation
-                for i in range(total_frames):
-                    frame = img.copy()
-                    
-                    # Add subtle animation effects
-                    if i % 5 == 0:  # Every 5th frame
-                        # Slight brightness variation
-                        enhancer = ImageEnhance.Brightness(frame)
-                        frame = enhancer.enhance(1.05)
-                    elif i % 3 == 0:  # Every 3rd frame
-                        # Slight contrast variation
-                        enhancer = ImageEnhance.Contrast(frame)
-                        frame = enhancer.enhance(1.02)
-                    
-                    frames.append(frame)
-                
-                # Calculate optimized duration
-                total_duration = 3000  # 3 seconds total
-                frame_duration = total_duration // len(frames)
-                
-                # Save as optimized animated GIF
-                frames[0].save(
-                    output_path,
-                    format='GIF',
-                    save_all=True,
-                    append_images=frames[1:],
-                    duration=frame_duration,
-                    loop=0,
-                    optimize=True,
-                    disposal=2  # Background disposal
-                )
-                
-                # Optimize file size
-                await self._optimize_gif_size(output_path)
-                
-                return output_path
+            # Optimize file size
+            await self._optimize_gif_size(output_path)
+            
+            return output_path
                 
         except Exception as e:
             raise Exception(f"Image to animated GIF conversion failed: {str(e)}")
 
+    def _write_animated_gif(self, input_path, output_path):
+        """Build the animated GIF frames from a static image and save them"""
+        from PIL import Image, ImageEnhance
+        
+        with Image.open(input_path) as img:
+            # Convert to RGB if necessary
+            if img.mode != 'RGB':
+                img = img.convert('RGB')
+            
+            frames = []
+            total_frames = 15  # Reduced frames for better performance
+            base_duration = 150  # Base duration in ms
+            
+            # Create different variations for animation
+            for i in range(total_frames):
+                frame = img.copy()
+                
+                # Add subtle animation effects
+                if i % 5 == 0:  # Every 5th frame
+                    # Slight brightness variation
+                    enhancer = ImageEnhance.Brightness(frame)
+                    frame = enhancer.enhance(1.05)
+                elif i % 3 == 0:  # Every 3rd frame
+                    # Slight contrast variation
+                    enhancer = ImageEnhance.Contrast(frame)
+                    frame = enhancer.enhance(1.02)
+                
+                frames.append(frame)
+            
+            # Calculate optimized duration
+            total_duration = 3000  # 3 seconds total
+            frame_duration = total_duration // len(frames)
+            
+            # Save as optimized animated GIF
+            frames[0].save(
+                output_path,
+                format='GIF',
+                save_all=True,
+                append_images=frames[1:],
+                duration=frame_duration,
+                loop=0,
+                optimize=True,
+                disposal=2  # Background disposal
+            )
+
     async def _convert_video_to_gif_ffmpeg(self, input_path, output_path):
         """Convert video to high-quality optimized GIF using FFmpeg"""
         try:
@@ -308,8 +440,6 @@ class UniversalConverter:
     async def _optimize_gif_size(self, gif_path):
         """Optimize GIF file size using various techniques"""
         try:
-            from PIL import Image, ImageSequence
-            
             # Check if file size is reasonable (under 8MB)
             file_size = os.path.getsize(gif_path)
             if file_size <= 8 * 1024 * 1024:  # 8MB
@@ -318,39 +448,7 @@ class UniversalConverter:
             logger.info(f"Optimizing GIF size: {file_size / (1024 * 1024):.1f}MB")
             
             # Re-encode with PIL for better compression
-            with Image.open(gif_path) as img:
-                frames = []
-                durations = []
-                
-                # Extract frames and durations
-                for frame in ImageSequence.Iterator(img):
-                    frames.append(frame.copy())
-                    # Get frame duration (default to 100ms if not available)
-                    try:
-                        duration = frame.info.get('duration', 100)
-                        durations.append(duration)
-                    except:
-                        durations.append(100)
-                
-                # Reduce number of frames if too many
-                if len(frames) > 30:
-                    skip_factor = len(frames) // 15  # Target 15 frames
-                    frames = frames[::skip_factor]
-                    durations = durations[::skip_factor]
-                    frames = frames[:15]  # Max 15 frames
-                    durations = durations[:15]
-                
-                # Save with optimized settings
-                frames[0].save(
-                    gif_path,
-                    format='GIF',
-                    save_all=True,
-                    append_images=frames[1:],
-                    duration=durations[0] if durations else 100,
-                    loop=0,
-                    optimize=True,
-                    disposal=2
-                )
+            await asyncio.to_thread(self._reencode_gif, gif_path)
             
             optimized_size = os.path.getsize(gif_path)
             logger.info(f"GIF optimized: {optimized_size / (1024 * 1024):.1f}MB")
@@ -361,43 +459,83 @@ class UniversalConverter:
             logger.warning(f"GIF optimization failed: {e}")
             return gif_path  # Return original if optimization fails
     
+    def _reencode_gif(self, gif_path):
+        """Re-save a GIF with at most 15 frames"""
+        from PIL import Image, ImageSequence
+        
+        with Image.open(gif_path) as img:
+            frames = []
+            durations = []
+            
+            # Extract frames and durations
+            for frame in ImageSequence.Iterator(img):
+                frames.append(frame.copy())
+                # Get frame duration (default to 100ms if not available)
+                try:
+                    duration = frame.info.get('duration', 100)
+                    durations.append(duration)
+                except:
+                    durations.append(100)
+            
+            # Reduce number of frames if too many
+            if len(frames) > 30:
+                skip_factor = len(frames) // 15  # Target 15 frames
+                frames = frames[::skip_factor]
+                durations = durations[::skip_factor]
+                frames = frames[:15]  # Max 15 frames
+                durations = durations[:15]
+            
+            # Save with optimized settings
+            frames[0].save(
+                gif_path,
+                format='GIF',
+                save_all=True,
+                append_images=frames[1:],
+                duration=durations[0] if durations else 100,
+                loop=0,
+                optimize=True,
+                disposal=2
+            )
+    
     async def _image_to_pdf_advanced(self, input_path, output_path):
         """Professional image to PDF conversion"""
         try:
-            from PIL import Image
-            from reportlab.pdfgen import canvas
-            from reportlab.lib.pagesizes import letter, A4
-            from reportlab.lib.utils import ImageReader
-            
-            with Image.open(input_path) as img:
-                # Use ReportLab for professional PDF creation
-                c = canvas.Canvas(output_path, pagesize=letter)
-                width, height = letter
-                
-                # Calculate scaling to fit image on page
-                img_width, img_height = img.size
-                scale_x = width / img_width
-                scale_y = height / img_height
-                scale = min(scale_x, scale_y) * 0.9  # 90% of page with margin
-                
-                # Calculate position to center image
-                x = (width - (img_width * scale)) / 2
-                y = (height - (img_height * scale)) / 2
-                
-                # Draw image
-                img_temp_path = input_path + '_temp.jpg'
-                img.convert('RGB').save(img_temp_path, 'JPEG', quality=90)
-                c.drawImage(img_temp_path, x, y, img_width * scale, img_height * scale)
-                c.save()
-                
-                # Cleanup temp file
-                if os.path.exists(img_temp_path):
-                    os.remove(img_temp_path)
-                    
-            return output_path
+            return await asyncio.to_thread(self._write_image_pdf, input_path, output_path)
         except Exception as e:
             raise Exception(f"Professional image to PDF conversion failed: {str(e)}")
     
+    def _write_image_pdf(self, input_path, output_path):
+        """Render an image centred on a letter page"""
+        from PIL import Image
+        from reportlab.pdfgen import canvas
+        from reportlab.lib.pagesizes import letter, A4
+        from reportlab.lib.utils import ImageReader
+        
+        with Image.open(input_path) as img:
+            # Use ReportLab for professional PDF creation (rendered in memory)
+            buffer = BytesIO()
+            c = canvas.Canvas(buffer, pagesize=letter)
+            width, height = letter
+            
+            # Calculate scaling to fit image on page
+            img_width, img_height = img.size
+            scale_x = width / img_width
+            scale_y = height / img_height
+            scale = min(scale_x, scale_y) * 0.9  # 90% of page with margin
+            
+            # Calculate position to center image
+            x = (width - (img_width * scale)) / 2
+            y = (height - (img_height * scale)) / 2
+            
+            # Draw image from an in-memory JPEG instead of a temp file
+            img_buffer = BytesIO()
+            img.convert('RGB').save(img_buffer, 'JPEG', quality=90)
+            img_buffer.seek(0)
+            c.drawImage(ImageReader(img_buffer), x, y, img_width * scale, img_height * scale)
+            c.save()
+            self._write_output(output_path, buffer)
+        return output_path
+    
     async def _convert_audio(self, input_path, output_format, input_extension):
         """Convert audio files using FFmpeg with smart compression"""
         try:
@@ -551,59 +689,69 @@ class UniversalConverter:
             
             output_path = input_path.rsplit('.', 1)[0] + f'.{output_format}'
             
-            cmd = [
-                'ffmpeg', '-i', input_path,
-                '-y',
-                '-loglevel', 'error',
-                '-hide_banner',
-            ]
-            
-            # Professional video conversion settings
-            if output_format == 'mp4':
-                cmd.extend([
-                    '-c:v', 'libx264', '-preset', 'medium', '-crf', '23',
-                    '-c:a', 'aac', '-b:a', '192k',
-                    '-movflags', '+faststart'
-                ])
-            elif output_format == 'avi':
-                cmd.extend([
-                    '-c:v', 'mpeg4', '-qscale:v', '3',
-                    '-c:a', 'mp3', '-b:a', '192k'
-                ])
-            elif output_format == 'mov':
-                cmd.extend([
-                    '-c:v', 'libx264', '-preset', 'medium', '-crf', '23',
-                    '-c:a', 'aac', '-b:a', '192k'
-                ])
-            elif output_format == 'mkv':
-                cmd.extend([
-                    '-c:v', 'libx264', '-preset', 'medium', '-crf', '23',
-                    '-c:a', 'aac', '-b:a', '192k'
-                ])
-            elif output_format == 'gif':
+            if output_format == 'gif':
                 # Use our enhanced GIF conversion for videos
                 return await self._convert_video_to_gif_ffmpeg(input_path, output_path)
             
-            if output_format != 'gif':  # Already handled for GIF
-                cmd.append(output_path)
-            
-            process = await asyncio.create_subprocess_exec(
-                *cmd,
-                stdout=asyncio.subprocess.PIPE,
-                stderr=asyncio.subprocess.PIPE
-            )
+            hw_encoder = None
+            if output_format in ['mp4', 'mov', 'mkv']:
+                hw_encoder = await self._hardware_h264_encoder()
             
-            stdout, stderr = await asyncio.wait_for(process.communicate(), timeout=300)
+            # A GPU that passed the probe can still reject a stream; libx264 is the fallback
+            for encoder in dict.fromkeys([hw_encoder, None]):
+                cmd = self._video_command(input_path, output_path, output_format, encoder)
+                
+                process = await asyncio.create_subprocess_exec(
+                    *cmd,
+                    stdout=asyncio.subprocess.PIPE,
+                    stderr=asyncio.subprocess.PIPE
+                )
+                
+                stdout, stderr = await asyncio.wait_for(process.communicate(), timeout=300)
+                
+                if process.returncode == 0 and os.path.exists(output_path):
+                    return output_path
+                if encoder:
+                    logger.warning(f"{encoder} video encode failed, retrying with libx264")
             
-            if process.returncode == 0 and os.path.exists(output_path):
-                return output_path
-            else:
-                error_msg = stderr.decode('utf-8', errors='ignore') if stderr else "Video conversion failed"
-                raise Exception(f"Professional video conversion error: {error_msg}")
+            error_msg = stderr.decode('utf-8', errors='ignore') if stderr else "Video conversion failed"
+            raise Exception(f"Professional video conversion error: {error_msg}")
                 
         except Exception as e:
             raise Exception(f"Professional video conversion failed: {str(e)}")
     
+    def _video_command(self, input_path, output_path, output_format, hw_encoder=None):
+        """Build the ffmpeg command for a video conversion"""
+        decode_args, h264_args = _HW_H264_ENCODERS.get(hw_encoder, _SOFTWARE_H264)
+        
+        cmd = [
+            'ffmpeg', *decode_args, '-i', input_path,
+            '-y',
+            '-loglevel', 'error',
+            '-hide_banner',
+        ]
+        
+        # Professional video conversion settings
+        if output_format == 'mp4':
+            cmd.extend([
+                *h264_args,
+                '-c:a', 'aac', '-b:a', '192k',
+                '-movflags', '+faststart'
+            ])
+        elif output_format == 'avi':
+            cmd.extend([
+                '-c:v', 'mpeg4', '-qscale:v', '3',
+                '-c:a', 'mp3', '-b:a', '192k'
+            ])
+        elif output_format in ['mov', 'mkv']:
+            cmd.extend([
+                *h264_args,
+                '-c:a', 'aac', '-b:a', '192k'
+            ])
+        
+        cmd.append(output_path)
+        return cmd
+    
     async def _convert_document(self, input_path, output_format, input_extension):
         """Professional document conversion with high accuracy"""
         try:
@@ -655,73 +803,117 @@ class UniversalConverter:
     async def _pdf_to_text_advanced(self, input_path, output_path):
         """Advanced PDF to text conversion with formatting preservation"""
         try:
-            import fitz  # PyMuPDF
-            
-            doc = fitz.open(input_path)
-            text_content = ""
-            
-            for page_num in range(len(doc)):
-                page = doc.load_page(page_num)
-                text = page.get_text("text")  # Use "text" for better formatting
-                if text.strip():
-                    text_content += f"--- Page {page_num + 1} ---\n{text}\n\n"
-            
-            doc.close()
+            has_text = await asyncio.to_thread(self._write_pdf_text, input_path, output_path)
             
-            if text_content.strip():
-                with open(output_path, 'w', encoding='utf-8') as f:
-                    f.write(text_content)
+            if has_text:
                 return output_path
             else:
+                os.remove(output_path)
                 raise Exception("No text content found in PDF")
                 
         except Exception as e:
             raise Exception(f"Advanced PDF to text conversion failed: {str(e)}")
     
+    def _write_pdf_text(self, input_path, output_path):
+        """Stream per-page PDF text to the output file; returns whether any text was found"""
+        fitz = _require('fitz')  # PyMuPDF
+        fitz.TOOLS.mupdf_display_errors(False)
+        text_flags = fitz.TEXT_PRESERVE_WHITESPACE | fitz.TEXT_PRESERVE_LIGATURES | fitz.TEXT_MEDIABOX_CLIP
+        
+        has_text = False
+        with fitz.open(input_path) as doc, \
+                open(output_path, 'w', encoding='utf-8', buffering=1 << 20) as f:
+            for page_num in range(len(doc)):
+                page = doc.load_page(page_num)
+                text = page.get_text("text", flags=text_flags, sort=False)  # Use "text" for better formatting
+                if text.strip():
+                    f.write(f"--- Page {page_num + 1} ---\n")
+                    f.write(text)
+                    f.write("\n\n")
+                    has_text = True
+                del page
+                # Drop MuPDF's cached page resources periodically to bound memory
+                if page_num % 50 == 49:
+                    fitz.TOOLS.store_shrink(100)
+        return has_text
+    
     async def _pdf_to_images_advanced(self, input_path, output_path, output_format):
         """Convert PDF to high-quality images (all pages)"""
         try:
-            from pdf2image import convert_from_path
-            import fitz
-            
             # First, check if PDF has multiple pages
-            doc = fitz.open(input_path)
-            page_count = len(doc)
-            doc.close()
+            page_count = await asyncio.to_thread(self._pdf_page_count, input_path)
             
             if page_count == 1:
                 # Single page - convert directly
-                images = convert_from_path(input_path, dpi=300, first_page=1, last_page=1)
-                if images:
-                    images[0].save(output_path, format=output_format.upper(), quality=95)
+                if await asyncio.to_thread(self._render_single_page, input_path, output_path, output_format):
                     return output_path
             else:
                 # Multiple pages - create a ZIP file with all pages
-                import zipfile
-                zip_path = output_path.rsplit('.', 1)[0] + '_all_pages.zip'
+                output_stem = output_path.rsplit('.', 1)[0]
+                zip_path = output_stem + '_all_pages.zip'
                 
-                images = convert_from_path(input_path, dpi=300)
-                with zipfile.ZipFile(zip_path, 'w') as zipf:
-                    for i, image in enumerate(images):
-                        img_path = f"{output_path.rsplit('.', 1)[0]}_page_{i+1}.{output_format}"
-                        image.save(img_path, format=output_format.upper(), quality=95)
-                        zipf.write(img_path, f"page_{i+1}.{output_format}")
-                        os.remove(img_path)  # Cleanup individual files
+                # Bounded page ranges keep each worker's memory to one batch
+                batch_size = min(Config.PDF_IMAGE_BATCH_PAGES, -(-page_count // PDF_RENDER_WORKERS))
+                loop = asyncio.get_running_loop()
+                page_paths = await asyncio.gather(*[
+                    loop.run_in_executor(
+                        _render_pool, _render_pdf_page_range, input_path, first_page,
+                        min(first_page + batch_size - 1, page_count), 300, output_stem, output_format
+                    )
+                    for first_page in range(1, page_count + 1, batch_size)
+                ])
                 
+                await asyncio.to_thread(
+                    self._zip_page_images, zip_path, [path for chunk in page_paths for path in chunk], output_format
+                )
                 return zip_path
                 
             raise Exception("No pages found in PDF")
         except Exception as e:
             raise Exception(f"Advanced PDF to image conversion failed: {str(e)}")
     
+    def _pdf_page_count(self, input_path):
+        """Number of pages in a PDF"""
+        fitz = _require('fitz')
+        
+        with fitz.open(input_path) as doc:
+            return len(doc)
+    
+    def _render_single_page(self, input_path, output_path, output_format):
+        """Render the only page of a PDF; returns False if nothing was rendered"""
+        convert_from_path = _require('pdf2image').convert_from_path
+        
+        images = convert_from_path(input_path, dpi=300, first_page=1, last_page=1)
+        if not images:
+            return False
+        self._save_page_image(images[0], output_path, output_format)
+        return True
+    
+    def _zip_page_images(self, zip_path, img_paths, output_format):
+        """Pack rendered page images into a ZIP, removing the loose files"""
+        with zipfile.ZipFile(zip_path, 'w') as zipf:
+            for i, img_path in enumerate(img_paths):
+                zipf.write(img_path, f"page_{i+1}.{output_format}")
+                os.remove(img_path)  # Cleanup individual files
+        return zip_path
+    
+    @staticmethod
+    def _save_page_image(image, output_path, output_format):
+        """Save a rendered PDF page with encoder options suited to the format"""
+        if output_format in ['jpg', 'jpeg']:
+            # Optimized Huffman tables + progressive scan give smaller JPEGs
+            image.save(output_path, format='JPEG', quality=90, optimize=True, progressive=True)
+        elif output_format == 'png':
+            # PNG ignores quality; optimize=True would force the slowest zlib level
+            image.save(output_path, format='PNG', compress_level=6)
+        else:
+            image.save(output_path, format=output_format.upper())
+        return output_path
+    
     async def _pdf_to_docx_advanced(self, input_path, output_path):
         """Advanced PDF to DOCX conversion"""
         try:
-            from pdf2docx import Converter
-            
-            cv = Converter(input_path)
-            cv.convert(output_path, start=0, end=None)
-            cv.close()
+            await asyncio.to_thread(self._run_pdf2docx, input_path, output_path)
             
             # Verify conversion was successful
             if os.path.exists(output_path) and os.path.getsize(output_path) > 0:
@@ -732,51 +924,72 @@ class UniversalConverter:
         except Exception as e:
             raise Exception(f"Advanced PDF to DOCX conversion failed: {str(e)}")
     
+    def _run_pdf2docx(self, input_path, output_path):
+        """Run pdf2docx over the whole document, splitting large PDFs across processes"""
+        Converter = _require('pdf2docx').Converter
+        
+        # pdf2docx parses page ranges in its own worker processes and merges the result itself
+        options = {}
+        if self._pdf_page_count(input_path) >= Config.PDF_DOCX_PARALLEL_PAGES:
+            options = {'multi_processing': True, 'cpu_count': PDF_RENDER_WORKERS}
+        
+        cv = Converter(input_path)
+        try:
+            cv.convert(output_path, start=0, end=None, **options)
+        finally:
+            cv.close()
+        return output_path
+    
     async def _pdf_to_excel_advanced(self, input_path, output_path):
         """Advanced PDF to Excel conversion with table detection"""
         try:
-            import fitz
-            import pandas as pd
-            import pdfplumber
-            
-            all_data = []
-            
-            # Try pdfplumber first for better table detection
-            with pdfplumber.open(input_path) as pdf:
-                for page_num, page in enumerate(pdf.pages):
-                    tables = page.extract_tables()
-                    for table_num, table in enumerate(tables):
-                        if table and len(table) > 1:  # At least header and one row
-                            df = pd.DataFrame(table[1:], columns=table[0])
-                            all_data.append((f"Page_{page_num+1}_Table_{table_num+1}", df))
+            if await asyncio.to_thread(self._write_pdf_tables, input_path, output_path):
+                return output_path
+            else:
+                raise Exception("No extractable content found in PDF")
+                
+        except Exception as e:
+            raise Exception(f"Advanced PDF to Excel conversion failed: {str(e)}")
+    
+    def _write_pdf_tables(self, input_path, output_path):
+        """Write PDF tables (or page text) to Excel sheets; returns False if nothing was found"""
+        fitz = _require('fitz')
+        pd = _require('pandas')
+        
+        all_data = []
+        
+        with fitz.open(input_path) as doc:
+            # MuPDF's table finder runs in C - no pdfminer layout pass per character
+            for page_num, page in enumerate(doc):
+                for table_num, table in enumerate(page.find_tables().tables):
+                    rows = table.extract()
+                    if rows and len(rows) > 1:  # At least header and one row
+                        df = pd.DataFrame(rows[1:], columns=rows[0])
+                        all_data.append((f"Page_{page_num+1}_Table_{table_num+1}", df))
             
             # If no tables found, extract text
             if not all_data:
-                doc = fitz.open(input_path)
-                for page_num in range(len(doc)):
-                    page = doc.load_page(page_num)
+                for page_num, page in enumerate(doc):
                     text = page.get_text()
                     if text.strip():
                         # Create a simple DataFrame from text
                         lines = [line.strip() for line in text.split('\n') if line.strip()]
                         df = pd.DataFrame(lines, columns=[f"Content_Page_{page_num+1}"])
                         all_data.append((f"Page_{page_num+1}", df))
-                doc.close()
-            
-            if all_data:
-                # Save all data to Excel with multiple sheets
-                with pd.ExcelWriter(output_path, engine='openpyxl') as writer:
-                    for sheet_name, df in all_data:
-                        # Truncate sheet name if too long
-                        sheet_name = sheet_name[:31]
-                        df.to_excel(writer, sheet_name=sheet_name, index=False)
-                
-                return output_path
-            else:
-                raise Exception("No extractable content found in PDF")
-                
-        except Exception as e:
-            raise Exception(f"Advanced PDF to Excel conversion failed: {str(e)}")
+        
+        if not all_data:
+            return False
+        
+        # xlsxwriter writes much faster than openpyxl; it is optional, so fall back
+        engine = 'xlsxwriter' if _load_module('xlsxwriter') is not _MISSING else 'openpyxl'
+        
+        # Save all data to Excel with multiple sheets
+        with pd.ExcelWriter(output_path, engine=engine) as writer:
+            for sheet_name, df in all_data:
+                # Truncate sheet name if too long
+                sheet_name = sheet_name[:31]
+                df.to_excel(writer, sheet_name=sheet_name, index=False)
+        return True
     
     async def _text_to_pdf_advanced(self, input_path, output_path):
         """Advanced text to PDF conversion with professional formatting"""
@@ -789,13 +1002,10 @@ class UniversalConverter:
             from reportlab.pdfbase import pdfmetrics
             from reportlab.pdfbase.ttfonts import TTFont
             
-            # Read text content
-            with open(input_path, 'r', encoding='utf-8', errors='ignore') as f:
-                text_content = f.read()
-            
-            # Create professional PDF
+            # Create professional PDF (rendered in memory, written once)
+            buffer = BytesIO()
             doc = SimpleDocTemplate(
-                output_path,
+                buffer,
                 pagesize=letter,
                 rightMargin=72,
                 leftMargin=72,
@@ -804,7 +1014,6 @@ class UniversalConverter:
             )
             
             styles = getSampleStyleSheet()
-            story = []
             
             # Custom style for better readability
             custom_style = ParagraphStyle(
@@ -815,15 +1024,12 @@ class UniversalConverter:
                 spaceAfter=12
             )
             
-            # Split text into paragraphs and add to story
-            paragraphs = text_content.split('\n')
-            for para in paragraphs:
-                if para.strip():
-                    story.append(Paragraph(para.strip(), custom_style))
-                    story.append(Spacer(1, 12))
+            # Build paragraphs line by line - the whole file is never held as one string
+            story = await asyncio.to_thread(self._text_story, input_path, custom_style)
             
             if story:
-                doc.build(story)
+                await asyncio.to_thread(doc.build, story)
+                self._write_output(output_path, buffer)
                 return output_path
             else:
                 raise Exception("No content to convert")
@@ -834,58 +1040,61 @@ class UniversalConverter:
     async def _text_to_docx_advanced(self, input_path, output_path):
         """Advanced text to DOCX conversion"""
         try:
-            from docx import Document
-            from docx.shared import Pt  # Fixed import
-            
-            with open(input_path, 'r', encoding='utf-8') as f:
-                text_content = f.read()
-            
-            doc = Document()
-            
-            # Add professional styling
-            style = doc.styles['Normal']
-            style.font.name = 'Arial'
-            style.font.size = Pt(11)  # Fixed: Use Pt directly
-            
-            # Add content with proper paragraph formatting
-            paragraphs = text_content.split('\n')
-            for para in paragraphs:
-                if para.strip():
-                    p = doc.add_paragraph(para.strip())
-                    p.paragraph_format.space_after = Pt(6)  # Fixed: Use Pt directly
-            
-            doc.save(output_path)
-            return output_path
+            return await asyncio.to_thread(self._write_text_docx, input_path, output_path)
             
         except Exception as e:
             raise Exception(f"Advanced text to DOCX conversion failed: {str(e)}")
     
+    def _write_text_docx(self, input_path, output_path):
+        """Build a DOCX from a text file one line at a time"""
+        from docx import Document
+        from docx.shared import Pt  # Fixed import
+        
+        doc = Document()
+        
+        # Add professional styling
+        style = doc.styles['Normal']
+        style.font.name = 'Arial'
+        style.font.size = Pt(11)  # Fixed: Use Pt directly
+        
+        # Add content with proper paragraph formatting
+        for para in self._iter_text_paragraphs(input_path):
+            p = doc.add_paragraph(para)
+            p.paragraph_format.space_after = Pt(6)  # Fixed: Use Pt directly
+        
+        doc.save(output_path)
+        return output_path
+    
+    def _text_story(self, input_path, style):
+        """Build ReportLab flowables for a text file one line at a time"""
+        from reportlab.platypus import Paragraph, Spacer
+        
+        story = []
+        for para in self._iter_text_paragraphs(input_path, errors='ignore'):
+            story.append(Paragraph(para, style))
+            story.append(Spacer(1, 12))
+        return story
+    
+    def _iter_text_paragraphs(self, input_path, errors='strict'):
+        """Yield the non-blank lines of a text file, stripped"""
+        with open(input_path, 'r', encoding='utf-8', errors=errors) as f:
+            for line in f:
+                para = line.strip()
+                if para:
+                    yield para
+    
     async def _docx_to_pdf_advanced(self, input_path, output_path):
         """Advanced DOCX to PDF conversion using LibreOffice"""
         try:
             # Use LibreOffice for highest quality conversion
-            cmd = [
-                'libreoffice', '--headless', '--convert-to', 'pdf:writer_pdf_Export',
-                '--outdir', os.path.dirname(output_path), input_path
-            ]
-            
-            await self._run_command(cmd, timeout=120)
-            
-            # Find the converted file
-            base_name = os.path.splitext(os.path.basename(input_path))[0]
-            possible_path = os.path.join(os.path.dirname(output_path), base_name + '.pdf')
+            if not await self._run_libreoffice(input_path, output_path, 'pdf:writer_pdf_Export', timeout=120):
+                raise Exception("DOCX to PDF conversion failed - output not found")
             
-            if os.path.exists(possible_path):
-                if possible_path != output_path:
-                    os.rename(possible_path, output_path)
-                
-                # Verify the PDF is valid
-                if os.path.getsize(output_path) > 0:
-                    return output_path
-                else:
-                    raise Exception("Conversion produced empty PDF")
+            # Verify the PDF is valid
+            if os.path.getsize(output_path) > 0:
+                return output_path
             else:
-                raise Exception("DOCX to PDF conversion failed - output not found")
+                raise Exception("Conversion produced empty PDF")
                 
         except Exception as e:
             raise Exception(f"Advanced DOCX to PDF conversion failed: {str(e)}")
@@ -893,28 +1102,15 @@ class UniversalConverter:
     async def _docx_to_text_advanced(self, input_path, output_path):
         """Advanced DOCX to text conversion with formatting"""
         try:
-            from docx import Document
-            
-            doc = Document(input_path)
-            text_content = []
-            
-            for paragraph in doc.paragraphs:
-                if paragraph.text.strip():
-                    text_content.append(paragraph.text)
-            
-            # Add table content
-            for table in doc.tables:
-                for row in table.rows:
-                    row_text = []
-                    for cell in row.cells:
-                        if cell.text.strip():
-                            row_text.append(cell.text.strip())
-                    if row_text:
-                        text_content.append(' | '.join(row_text))
+            try:
+                text_content = await asyncio.to_thread(self._read_docx_xml_text, input_path)
+            except (ImportError, KeyError, ValueError, SyntaxError, zipfile.BadZipFile) as e:
+                logger.warning(f"Direct DOCX XML parse failed, using python-docx: {e}")
+                text_content = await asyncio.to_thread(self._read_docx_text, input_path)
             
             if text_content:
-                with open(output_path, 'w', encoding='utf-8') as f:
-                    f.write('\n'.join(text_content))
+                async with aiofiles.open(output_path, 'w', encoding='utf-8') as f:
+                    await f.write('\n'.join(text_content))
                 return output_path
             else:
                 raise Exception("No content found in DOCX file")
@@ -922,49 +1118,163 @@ class UniversalConverter:
         except Exception as e:
             raise Exception(f"Advanced DOCX to text conversion failed: {str(e)}")
     
+    def _read_docx_xml_text(self, input_path):
+        """Read DOCX paragraphs and table rows straight from word/document.xml"""
+        from lxml import etree
+        
+        with zipfile.ZipFile(input_path) as archive:
+            root = etree.fromstring(archive.read('word/document.xml'))
+        
+        body = root.find(_W + 'body')
+        if body is None:
+            raise ValueError("document.xml has no body")
+        
+        paragraphs = []
+        rows = []
+        for child in body:
+            if child.tag == _W + 'p':
+                text = self._docx_paragraph_text(child)
+                if text.strip():
+                    paragraphs.append(text)
+            elif child.tag == _W + 'tbl':
+                for row in child.findall(_W + 'tr'):
+                    row_text = []
+                    for cell in row.findall(_W + 'tc'):
+                        cell_text = '\n'.join(self._docx_paragraph_text(p) for p in cell.findall(_W + 'p')).strip()
+                        if cell_text:
+                            row_text.append(cell_text)
+                    if row_text:
+                        rows.append(' | '.join(row_text))
+        
+        # Same order as python-docx: body paragraphs first, then tables
+        return paragraphs + rows
+    
+    def _docx_paragraph_text(self, paragraph):
+        """Text of a w:p element, with tabs and breaks rendered like python-docx"""
+        parts = []
+        for run in self._docx_paragraph_runs(paragraph):
+            for child in run:
+                if child.tag == _W + 't':
+                    parts.append(child.text or '')
+                elif child.tag == _W + 'tab':
+                    parts.append('\t')
+                elif child.tag in (_W + 'br', _W + 'cr'):
+                    parts.append('\n')
+        return ''.join(parts)
+    
+    def _docx_paragraph_runs(self, paragraph):
+        """Runs that belong to the paragraph itself, skipping those nested in text boxes and fallbacks"""
+        for child in paragraph:
+            if child.tag == _W + 'r':
+                yield child
+            elif child.tag in (_W + 'hyperlink', _W + 'ins', _W + 'smartTag'):
+                yield from child.findall(_W + 'r')
+    
+    def _read_docx_text(self, input_path):
+        """Read DOCX paragraphs and table rows with python-docx"""
+        from docx import Document
+        
+        doc = Document(input_path)
+        text_content = []
+        
+        for paragraph in doc.paragraphs:
+            if paragraph.text.strip():
+                text_content.append(paragraph.text)
+        
+        # Add table content
+        for table in doc.tables:
+            for row in table.rows:
+                row_text = []
+                for cell in row.cells:
+                    if cell.text.strip():
+                        row_text.append(cell.text.strip())
+                if row_text:
+                    text_content.append(' | '.join(row_text))
+        
+        return text_content
+    
     async def _excel_to_pdf_advanced(self, input_path, output_path):
         """Advanced Excel to PDF conversion"""
         try:
             # Use LibreOffice for best Excel to PDF conversion
-            cmd = [
-                'libreoffice', '--headless', '--convert-to', 'pdf:calc_pdf_Export',
-                '--outdir', os.path.dirname(output_path), input_path
-            ]
-            
-            await self._run_command(cmd, timeout=120)
-            
-            base_name = os.path.splitext(os.path.basename(input_path))[0]
-            possible_path = os.path.join(os.path.dirname(output_path), base_name + '.pdf')
-            
-            if os.path.exists(possible_path):
-                if possible_path != output_path:
-                    os.rename(possible_path, output_path)
-                return output_path
-            else:
+            if not await self._run_libreoffice(input_path, output_path, 'pdf:calc_pdf_Export', timeout=120):
                 raise Exception("Excel to PDF conversion failed")
-                
+            return output_path
+        
         except Exception as e:
-            raise Exception(f"Advanced Excel to PDF conversion failed: {str(e)}")
+            logger.warning(f"LibreOffice Excel conversion failed, trying table fallback: {e}")
+            try:
+                return await self._excel_to_pdf_table(input_path, output_path)
+            except Exception as fallback_error:
+                raise Exception(f"Advanced Excel to PDF conversion failed: {str(fallback_error)}")
+    
+    async def _excel_to_pdf_table(self, input_path, output_path):
+        """Excel to PDF fallback using ReportLab's Table flowable"""
+        # Reading the workbook and laying out the tables are both blocking
+        return await asyncio.to_thread(self._write_excel_table_pdf, input_path, output_path)
+    
+    def _write_excel_table_pdf(self, input_path, output_path):
+        """Read every sheet and render it as a PDF table"""
+        from openpyxl import load_workbook
+        from reportlab.lib import colors
+        from reportlab.lib.pagesizes import letter, landscape
+        from reportlab.platypus import SimpleDocTemplate, Table, TableStyle, PageBreak
+        
+        # Read raw cell values directly - no DataFrame/dtype conversion needed
+        workbook = load_workbook(input_path, read_only=True, data_only=True)
+        
+        story = []
+        try:
+            for sheet in workbook.worksheets:
+                data = [
+                    ['' if value is None else str(value) for value in row]
+                    for row in sheet.iter_rows(values_only=True)
+                    if any(value is not None for value in row)
+                ]
+                if not data:
+                    continue
+                
+                # Read-only sheets can yield ragged rows; Table needs a rectangle
+                width = max(len(row) for row in data)
+                for row in data:
+                    row.extend([''] * (width - len(row)))
+                
+                # Table computes column widths and splits across pages itself
+                table = Table(data, repeatRows=1)
+                table.setStyle(TableStyle([
+                    ('BACKGROUND', (0, 0), (-1, 0), colors.lightgrey),
+                    ('FONTNAME', (0, 0), (-1, 0), 'Helvetica-Bold'),
+                    ('FONTSIZE', (0, 0), (-1, -1), 8),
+                    ('GRID', (0, 0), (-1, -1), 0.25, colors.grey),
+                    ('VALIGN', (0, 0), (-1, -1), 'TOP'),
+                ]))
+                if story:
+                    story.append(PageBreak())
+                story.append(table)
+        finally:
+            workbook.close()
+        
+        if not story:
+            raise Exception("No data found in Excel file")
+        
+        buffer = BytesIO()
+        doc = SimpleDocTemplate(
+            buffer,
+            pagesize=landscape(letter),
+            rightMargin=36,
+            leftMargin=36,
+            topMargin=36,
+            bottomMargin=36
+        )
+        doc.build(story)
+        return self._write_output(output_path, buffer)
     
     async def _odt_to_pdf_advanced(self, input_path, output_path):
         """Advanced ODT to PDF conversion"""
         try:
-            cmd = [
-                'libreoffice', '--headless', '--convert-to', 'pdf:writer_pdf_Export',
-                '--outdir', os.path.dirname(output_path), input_path
-            ]
-            
-            await self._run_command(cmd, timeout=120)
-            
-            base_name = os.path.splitext(os.path.basename(input_path))[0]
-            possible_path = os.path.join(os.path.dirname(output_path), base_name + '.pdf')
-            
-            if os.path.exists(possible_path):
-                if possible_path != output_path:
-                    os.rename(possible_path, output_path)
-                return output_path
-            else:
+            if not await self._run_libreoffice(input_path, output_path, 'pdf:writer_pdf_Export', timeout=120):
                 raise Exception("ODT to PDF conversion failed")
+            return output_path
                 
         except Exception as e:
             raise Exception(f"Advanced ODT to PDF conversion failed: {str(e)}")
@@ -986,33 +1296,48 @@ class UniversalConverter:
     async def _ppt_to_pdf_advanced(self, input_path, output_path):
         """Advanced PowerPoint to PDF conversion"""
         try:
-            cmd = [
-                'libreoffice', '--headless', '--convert-to', 'pdf:impress_pdf_Export',
-                '--outdir', os.path.dirname(output_path), input_path
-            ]
-            
-            await self._run_command(cmd, timeout=180)
-            
-            base_name = os.path.splitext(os.path.basename(input_path))[0]
-            possible_path = os.path.join(os.path.dirname(output_path), base_name + '.pdf')
-            
-            if os.path.exists(possible_path):
-                if possible_path != output_path:
-                    os.rename(possible_path, output_path)
-                return output_path
-            else:
+            if not await self._run_libreoffice(input_path, output_path, 'pdf:impress_pdf_Export', timeout=180):
                 raise Exception("PowerPoint to PDF conversion failed")
+            return output_path
                 
         except Exception as e:
             raise Exception(f"Advanced PowerPoint to PDF conversion failed: {str(e)}")
     
+    async def _run_libreoffice(self, input_path, output_path, convert_to, timeout=120):
+        """Run a LibreOffice export into a private directory; returns False if nothing was produced"""
+        # A per-call outdir means identically named inputs can't collide or be picked up by mistake
+        with tempfile.TemporaryDirectory(dir=os.path.dirname(output_path) or '.') as out_dir:
+            cmd = [
+                'libreoffice', '--headless', '--convert-to', convert_to,
+                '--outdir', out_dir, input_path
+            ]
+            
+            await self._run_command(cmd, timeout=timeout)
+            
+            produced = os.listdir(out_dir)
+            if not produced:
+                return False
+            os.replace(os.path.join(out_dir, produced[0]), output_path)
+            return True
+    
+    def _write_output(self, output_path, buffer):
+        """Write an in-memory rendered file to disk in a single write"""
+        data = memoryview(buffer.getbuffer())
+        with open(output_path, 'wb', buffering=0) as f:
+            while data:
+                written = f.write(data)
+                data = data[written:]
+        return output_path
+    
     async def _run_command(self, cmd, timeout=60):
         """Run system command with timeout"""
         try:
+            # No caller reads stdout; only stderr is kept for error messages
             process = await asyncio.create_subprocess_exec(
                 *cmd,
-                stdout=asyncio.subprocess.PIPE,
-                stderr=asyncio.subprocess.PIPE
+                stdout=asyncio.subprocess.DEVNULL,
+                stderr=asyncio.subprocess.PIPE,
+                start_new_session=True
             )
             
             stdout, stderr = await asyncio.wait_for(process.communicate(), timeout=timeout)
@@ -1021,7 +1346,7 @@ class UniversalConverter:
                 error_msg = stderr.decode() if stderr else "Command failed"
                 raise Exception(f"Command failed: {error_msg}")
             
-            return stdout.decode() if stdout else ""
+            return ""
             
         except asyncio.TimeoutError:
             raise Exception(f"Command timeout after {timeout} seconds")